@@ -0,0 +1,33 @@
+"""add_job_created_index
+
+Revision ID: job_created_idx_001
+Revises: updated_at_on_update_001
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'job_created_idx_001'
+down_revision: Union[str, Sequence[str], None] = 'updated_at_on_update_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 无过滤条件的Job列表按 created_at DESC, id DESC 分页；
+    # InnoDB 二级索引自带主键，分页主键可只扫描该索引得到
+    op.create_index(
+        'idx_job_created',
+        'linting_jobs',
+        ['created_at']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_job_created', table_name='linting_jobs')
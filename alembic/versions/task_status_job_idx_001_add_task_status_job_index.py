@@ -0,0 +1,33 @@
+"""add_task_status_job_index
+
+Revision ID: task_status_job_idx_001
+Revises: merge_heads_001
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'task_status_job_idx_001'
+down_revision: Union[str, Sequence[str], None] = 'merge_heads_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 按状态分桶再按 job_id 过滤/关联的查询可以只扫描索引；
+    # InnoDB 二级索引自带主键，无需额外 INCLUDE 列
+    op.create_index(
+        'idx_task_status_job_created',
+        'linting_tasks',
+        ['status', 'job_id', 'created_at']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_task_status_job_created', table_name='linting_tasks')
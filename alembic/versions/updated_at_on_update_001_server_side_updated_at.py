@@ -0,0 +1,47 @@
+"""server_side_updated_at
+
+Revision ID: updated_at_on_update_001
+Revises: task_status_job_idx_001
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'updated_at_on_update_001'
+down_revision: Union[str, Sequence[str], None] = 'task_status_job_idx_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('linting_jobs', 'linting_tasks')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 由 MySQL 在 UPDATE 时维护 updated_at，绕过 ORM 的原生 SQL 更新也能刷新时间
+    for table in TABLES:
+        op.alter_column(
+            table,
+            'updated_at',
+            existing_type=mysql.DATETIME(fsp=6),
+            existing_nullable=False,
+            existing_comment='最后更新时间',
+            server_default=sa.text('CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.alter_column(
+            table,
+            'updated_at',
+            existing_type=mysql.DATETIME(fsp=6),
+            existing_nullable=False,
+            existing_comment='最后更新时间',
+            server_default=None,
+        )
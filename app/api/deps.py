@@ -10,10 +10,10 @@ from sqlalchemy.orm import Session
 from typing import Optional
 import uuid
 
-from app.core.database import get_db
+from app.core.database import get_db, get_db_ro
 from app.services.job_service import JobService
 from app.services.task_service import TaskService
-from app.core.exceptions import ErrorCode, get_http_status_code
+from app.core.exceptions import ErrorCode
 from app.core.logging import api_logger
 
 
@@ -36,6 +36,11 @@ def get_task_service(db: Session = Depends(get_db)) -> TaskService:
     return TaskService(db)
 
 
+def get_read_job_service(db: Session = Depends(get_db_ro)) -> JobService:
+    """获取只读Job服务实例（仅用于不写库的查询接口）"""
+    return JobService(db)
+
+
 # ============= 参数验证依赖 =============
 
 def validate_job_id(job_id: str) -> str:
@@ -239,7 +244,7 @@ def handle_service_exception(e: Exception, operation: str = "操作") -> HTTPExc
     from app.core.exceptions import BaseException as BusinessException
     
     if isinstance(e, BusinessException):
-        status_code = get_http_status_code(e.error_code)
+        status_code = e.error_code.http_status
         api_logger.warning(f"{operation}失败: {e.detail}")
         return HTTPException(
             status_code=status_code,
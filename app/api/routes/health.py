@@ -13,7 +13,7 @@ from typing import Dict, Any
 from datetime import datetime
 import psutil
 
-from app.core.database import get_db
+from app.core.database import get_db, get_db_ro
 from app.core.logging import get_logger
 from app.config.settings import get_settings
 from app.utils.file_utils import FileManager
@@ -331,7 +331,7 @@ async def liveness_check():
 
 
 @router.get("/health/metrics")
-async def metrics_endpoint(db: Session = Depends(get_db)):
+async def metrics_endpoint(db: Session = Depends(get_db_ro)):
     """Prometheus指标端点"""
     try:
         from app.core.metrics import get_metrics, collect_queue_gauges
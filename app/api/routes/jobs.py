@@ -4,14 +4,16 @@ Job相关API路由
 实现核验工作(Job)相关的HTTP接口，包括创建、查询、状态管理等功能。
 """
 
+import asyncio
 import json
+import os
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
 from app.api.deps import (
-    get_job_service, validate_job_id, get_pagination_params,
+    get_job_service, get_read_job_service, validate_job_id, get_pagination_params,
     get_search_params, handle_service_exception
 )
 from app.services.job_service import JobService
@@ -27,6 +29,13 @@ from app.core.database import get_db
 router = APIRouter()
 
 
+def _write_upload_file(file_path: str, content: bytes) -> None:
+    """将上传内容写入NFS（同步 I/O，由调用方放到线程中执行）"""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "wb") as f:
+        f.write(content)
+
+
 @router.post("/jobs", response_model=JobCreateResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_job(
     request: JobCreateRequest,
@@ -111,7 +120,6 @@ async def create_job_with_upload(
             # 保存文件到NFS
             try:
                 import uuid
-                import os
                 from app.config.settings import get_settings
                 
                 settings = get_settings()
@@ -122,16 +130,12 @@ async def create_job_with_upload(
                 file_extension = os.path.splitext(zip_file.filename)[1]
                 unique_filename = f"{file_uuid}{file_extension}"
                 
-                # 创建上传目录
-                upload_dir = os.path.join(nfs_root, "uploads")
-                os.makedirs(upload_dir, exist_ok=True)
-                
                 # 完整文件路径
+                upload_dir = os.path.join(nfs_root, "uploads")
                 file_path = os.path.join(upload_dir, unique_filename)
                 
-                # 写入文件
-                with open(file_path, "wb") as f:
-                    f.write(file_content)
+                # NFS 写入延迟不可控，放到线程中执行，避免阻塞事件循环
+                await asyncio.to_thread(_write_upload_file, file_path, file_content)
                 
                 # 设置相对路径
                 zip_file_path = f"uploads/{unique_filename}"
@@ -217,6 +221,7 @@ async def create_job_from_extracted_folder(
 async def get_job(
     job_id: str = Query(..., description="核验工作ID"),
     pagination: tuple[int, int] = Depends(get_pagination_params),
+    # 创建后立即轮询状态，走主库：只读副本有复制延迟，刚创建的 Job 会 404
     job_service: JobService = Depends(get_job_service)
 ):
     """
@@ -257,13 +262,15 @@ async def list_jobs(
     pagination: tuple[int, int] = Depends(get_pagination_params),
     status_filter: Optional[JobStatusEnum] = Query(None, alias="status", description="状态过滤"),
     submission_type: Optional[SubmissionTypeEnum] = Query(None, description="提交类型过滤"),
-    job_service: JobService = Depends(get_job_service)
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor），传入时忽略页码"),
+    job_service: JobService = Depends(get_read_job_service)
 ):
     """
     获取核验工作列表
     
     支持分页查询和状态过滤。
     可以按照创建时间倒序返回Job列表。
+    深分页建议使用返回的 next_cursor 作为 cursor 参数继续翻页。
     """
     try:
         page, size = pagination
@@ -274,11 +281,12 @@ async def list_jobs(
             page=page,
             size=size,
             status=status_filter,
-            submission_type=submission_type
+            submission_type=submission_type,
+            cursor=cursor
         )
         
         response = JobListResponse(jobs=job_list)
-        api_logger.debug(f"Job列表查询成功: 总数={job_list.total}")
+        api_logger.debug(f"Job列表查询成功: 总数={job_list.total}, 本页={len(job_list.items)}")
         return response
         
     except Exception as e:
@@ -298,7 +306,7 @@ async def search_jobs(
     dialect: Optional[str] = Query(None, description="SQLFluff方言"),
     # 分页和排序参数
     search_params: dict = Depends(get_search_params),
-    job_service: JobService = Depends(get_job_service)
+    job_service: JobService = Depends(get_read_job_service)
 ):
     """
     高级搜索核验工作列表
@@ -355,7 +363,7 @@ async def search_jobs(
 
 @router.get("/jobs/statistics", response_model=JobStatistics)
 async def get_job_statistics(
-    job_service: JobService = Depends(get_job_service)
+    job_service: JobService = Depends(get_read_job_service)
 ):
     """
     获取核验工作统计信息
@@ -379,7 +387,7 @@ async def get_job_statistics(
 @router.get("/jobs/tasks", response_model=JobTaskIdsResponse)
 async def get_job_task_ids(
     job_id: str = Query(..., description="核验工作ID"),
-    job_service: JobService = Depends(get_job_service)
+    job_service: JobService = Depends(get_read_job_service)
 ):
     """
     获取核验工作下的所有任务ID列表
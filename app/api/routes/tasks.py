@@ -7,7 +7,6 @@ Task相关API路由
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import Optional, List
-import json
 
 from app.api.deps import (
     get_task_service, validate_task_id, get_pagination_params,
@@ -222,7 +221,7 @@ async def download_task_result(
         
         # 返回文件下载响应
         return Response(
-            content=json.dumps(result.dict(), ensure_ascii=False, indent=2),
+            content=result.model_dump_json(indent=2),
             media_type="application/json",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -26,6 +26,11 @@ class Settings(BaseSettings):
         description="MySQL数据库连接字符串",
         env="DATABASE_URL"
     )
+    DATABASE_READ_URL: Optional[str] = Field(
+        default=None,
+        description="只读副本连接字符串；未设置时只读会话复用主库连接池",
+        env="DATABASE_READ_URL"
+    )
     # 分离的数据库配置变量
     MYSQL_DATABASE_HOST: Optional[str] = Field(default=None, description="MySQL数据库主机", env="MYSQL_DATABASE_HOST")
     MYSQL_DATABASE_PORT: Optional[int] = Field(default=None, description="MySQL数据库端口", env="MYSQL_DATABASE_PORT")
@@ -156,6 +161,7 @@ class Settings(BaseSettings):
     
     # ============= 任务处理配置 =============
     MAX_CONCURRENT_TASKS: int = Field(default=8, description="最大并发任务数", env="MAX_CONCURRENT_TASKS")
+    JOB_STATISTICS_CACHE_TTL_SECONDS: int = Field(default=30, description="Job统计结果进程内缓存TTL（秒），0表示不缓存", env="JOB_STATISTICS_CACHE_TTL_SECONDS")
     
     # ============= 规则分级配置 =============
     RULE_SEVERITY_ENABLED: bool = Field(default=True, description="是否启用规则分级映射功能", env="RULE_SEVERITY_ENABLED")
@@ -232,8 +238,15 @@ class Settings(BaseSettings):
             return consul_url
         return v
     
-    def get_database_url(self) -> str:
-        """获取数据库连接URL"""
+    def get_database_url(self, readonly: bool = False) -> str:
+        """获取数据库连接URL
+
+        Args:
+            readonly: 为 True 且配置了 DATABASE_READ_URL 时返回只读副本地址
+        """
+        if readonly and self.DATABASE_READ_URL:
+            return self.DATABASE_READ_URL
+
         # 如果已经设置了DATABASE_URL，直接使用
         if self.DATABASE_URL:
             return self.DATABASE_URL
@@ -211,10 +211,10 @@ class ConsulClient:
         """
         try:
             # 检查数据库连接
-            from app.core.database import engine
+            from app.core.database import get_engine
             from sqlalchemy import text
             
-            with engine.connect() as conn:
+            with get_engine().connect() as conn:
                 conn.execute(text("SELECT 1"))
             
             self.logger.debug("服务健康检查通过")
@@ -5,13 +5,14 @@
 支持连接池、健康检查和异常处理。
 """
 
+from functools import lru_cache
 from sqlalchemy import create_engine, event
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from sqlalchemy.pool import QueuePool
-from sqlalchemy.exc import DisconnectionError
-from typing import Generator
+from typing import Generator, List
 import logging
+import os
 
 from app.config.settings import get_settings
 
@@ -22,46 +23,210 @@ settings = get_settings()
 _pool = settings.get_database_pool_config()
 _process_role = settings.get_process_role()
 
-# 数据库引擎配置
-engine = create_engine(
-    settings.get_database_url(),
-    # 连接池配置
-    poolclass=QueuePool,
-    pool_size=_pool["pool_size"],
-    max_overflow=_pool["max_overflow"],
-    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
-    pool_recycle=settings.DATABASE_POOL_RECYCLE,
-    pool_pre_ping=True,  # 启用连接健康检查
-    # MySQL特定配置
-    connect_args={
-        "charset": "utf8mb4",
-        "connect_timeout": 60,
-        "read_timeout": 60,
-        "write_timeout": 60,
-        "autocommit": False,  # 确保事务控制
-    },
-    # SQL 回显独立开关；勿与 DEBUG 绑定（Worker 轮询会刷屏）
-    echo=settings.DATABASE_ECHO,
-    echo_pool=False,
-    # 事务隔离级别 - 使用READ_COMMITTED避免幻读问题
-    isolation_level="READ_COMMITTED",
-)
 
-logger.info(
-    "Database engine created (role=%s, pool_size=%s, max_overflow=%s)",
-    _process_role,
-    _pool["pool_size"],
-    _pool["max_overflow"],
-)
+def _apply_session_settings(dbapi_connection, transactional: bool = True) -> None:
+    """
+    新连接建立时设置MySQL会话级配置
+
+    Args:
+        dbapi_connection: DBAPI 原始连接
+        transactional: 是否设置事务隔离级别并关闭自动提交；只读引擎以
+            AUTOCOMMIT 运行，只设置 SQL 模式，避免覆盖其自动提交设置
+    """
+    try:
+        cursor = dbapi_connection.cursor()
+        if transactional:
+            # 设置事务隔离级别为READ_COMMITTED
+            cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED")
+            # 设置自动提交为OFF
+            cursor.execute("SET SESSION autocommit = 0")
+        # 设置SQL模式
+        cursor.execute("SET SESSION sql_mode = 'STRICT_TRANS_TABLES,NO_ZERO_DATE,NO_ZERO_IN_DATE,ERROR_FOR_DIVISION_BY_ZERO'")
+        cursor.close()
+        logger.debug("MySQL会话配置已设置")
+    except Exception as e:
+        logger.warning(f"设置MySQL会话配置失败: {e}")
+
+
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    """数据库连接建立时的配置"""
+    # 对于MySQL，设置会话级别的配置
+    _apply_session_settings(dbapi_connection)
+
+
+def _set_read_session_options(dbapi_connection, connection_record):
+    """只读副本连接建立时的配置"""
+    _apply_session_settings(dbapi_connection, transactional=False)
+
+
+def invalidate_connection(dbapi_connection, connection_record, exception):
+    """连接失效时的处理"""
+    logger.warning(f"数据库连接失效: {exception}")
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """
+    创建（并缓存）进程内唯一的数据库引擎
+
+    测试中可通过 ``get_engine.cache_clear()`` 按新配置重建引擎。
+
+    Returns:
+        Engine: SQLAlchemy数据库引擎
+    """
+    new_engine = create_engine(
+        settings.get_database_url(),
+        # 连接池配置
+        poolclass=QueuePool,
+        pool_size=_pool["pool_size"],
+        max_overflow=_pool["max_overflow"],
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=True,  # 启用连接健康检查
+        # MySQL特定配置
+        connect_args={
+            "charset": "utf8mb4",
+            "connect_timeout": 60,
+            "read_timeout": 60,
+            "write_timeout": 60,
+            "autocommit": False,  # 确保事务控制
+        },
+        # SQL 回显独立开关；勿与 DEBUG 绑定（Worker 轮询会刷屏）。
+        # 生产环境即使误开 DATABASE_ECHO 也不逐条打印 SQL。
+        echo=settings.DATABASE_ECHO and not settings.is_production(),
+        echo_pool=False,
+        # 事务隔离级别 - 使用READ_COMMITTED避免幻读问题
+        isolation_level="READ_COMMITTED",
+    )
+    # 数据库连接池事件监听器。不注册 checkout/checkin 监听器：每次检出/归还
+    # 都会触发事件分发，连接健康检查已由 pool_pre_ping 负责。
+    event.listen(new_engine, "connect", set_sqlite_pragma)
+    event.listen(new_engine, "invalidate", invalidate_connection)
+
+    logger.info(
+        "Database engine created (role=%s, pool_size=%s, max_overflow=%s)",
+        _process_role,
+        _pool["pool_size"],
+        _pool["max_overflow"],
+    )
+    return new_engine
+
+
+@lru_cache(maxsize=1)
+def get_read_engine() -> Engine:
+    """
+    创建（并缓存）只读查询使用的数据库引擎
+
+    配置了 ``DATABASE_READ_URL`` 时连接只读副本并使用独立连接池（AUTOCOMMIT），
+    查询流量不再占用写连接池；否则直接返回主引擎，只读会话与 ``get_db``
+    完全一致。共享写连接池时不切换隔离级别：每次检出/归还都切换会多出
+    往返，抵消了只读会话的意义。
+
+    Returns:
+        Engine: SQLAlchemy数据库引擎
+    """
+    if not settings.DATABASE_READ_URL:
+        return get_engine()
+
+    read_engine = create_engine(
+        settings.get_database_url(readonly=True),
+        poolclass=QueuePool,
+        pool_size=_pool["pool_size"],
+        max_overflow=_pool["max_overflow"],
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args={
+            "charset": "utf8mb4",
+            "connect_timeout": 60,
+            "read_timeout": 60,
+            "write_timeout": 60,
+        },
+        echo=settings.DATABASE_ECHO and not settings.is_production(),
+        echo_pool=False,
+        isolation_level="AUTOCOMMIT",
+    )
+    # 只读副本使用独立连接池，同样需要会话级配置
+    event.listen(read_engine, "connect", _set_read_session_options)
+    logger.info(
+        "Read-only database engine created (role=%s, pool_size=%s, max_overflow=%s)",
+        _process_role,
+        _pool["pool_size"],
+        _pool["max_overflow"],
+    )
+    return read_engine
+
+
+def __getattr__(name: str):
+    """兼容 ``from app.core.database import engine``：首次访问时才创建引擎"""
+    if name == "engine":
+        return get_engine()
+    if name == "read_engine":
+        return get_read_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _created_engines() -> List[Engine]:
+    """已创建的引擎（未创建的不触发创建）；只读引擎复用主连接池时不重复列出"""
+    engines = []
+    if get_engine.cache_info().currsize:
+        engines.append(get_engine())
+    if settings.DATABASE_READ_URL and get_read_engine.cache_info().currsize:
+        engines.append(get_read_engine())
+    return engines
+
+
+def _dispose_pool_in_child() -> None:
+    """fork 出的子进程丢弃继承自父进程的连接池。
+
+    子进程与父进程共享同一批 socket，若直接复用会出现 "MySQL server has
+    gone away" 或协议错乱。``close=False`` 只丢弃引用、不关闭父进程仍在
+    使用的连接，子进程首次查询时按需重建连接。
+    """
+    for created_engine in _created_engines():
+        created_engine.dispose(close=False)
+
+
+# Gunicorn --preload 或 multiprocessing fork 模式下生效；当前分析子进程使用
+# spawn，不受影响。
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_pool_in_child)
+
+
+class _PrimarySession(Session):
+    """未显式绑定时在首次执行SQL才取主引擎，导入本模块不会建立连接池"""
+
+    def get_bind(self, mapper=None, **kw):
+        if self.bind is None and kw.get("bind") is None:
+            return get_engine()
+        return super().get_bind(mapper, **kw)
+
+
+class _ReadSession(Session):
+    """未显式绑定时在首次执行SQL才取只读引擎"""
+
+    def get_bind(self, mapper=None, **kw):
+        if self.bind is None and kw.get("bind") is None:
+            return get_read_engine()
+        return super().get_bind(mapper, **kw)
+
 
 # 会话工厂
 SessionLocal = sessionmaker(
+    class_=_PrimarySession,
     autocommit=False,
     autoflush=False,
-    bind=engine,
     expire_on_commit=False,  # 防止对象在提交后过期
 )
 
+# 只读会话工厂：仅用于不写库的查询接口
+ReadSessionLocal = sessionmaker(
+    class_=_ReadSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # 数据模型基类
 Base = declarative_base()
 
@@ -87,6 +252,24 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_db_ro() -> Generator[Session, None, None]:
+    """
+    只读数据库会话依赖注入函数
+
+    用于只查询不写库的接口（列表、统计），读流量与写连接池隔离。
+    只读副本存在复制延迟，刚创建的 Job 可能暂时查不到；创建后立即轮询
+    状态的接口应使用 ``get_db``。
+
+    Yields:
+        Session: SQLAlchemy数据库会话
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def create_database_session() -> Session:
     """
     创建独立的数据库会话
@@ -111,7 +294,7 @@ def test_database_connection() -> bool:
     """
     try:
         from sqlalchemy import text
-        with engine.connect() as connection:
+        with get_engine().connect() as connection:
             connection.execute(text("SELECT 1"))
         logger.info("数据库连接测试成功")
         return True
@@ -127,49 +310,13 @@ def close_database_connections():
     用于应用程序关闭时清理资源。
     """
     try:
-        engine.dispose()
+        for created_engine in _created_engines():
+            created_engine.dispose()
         logger.info("数据库连接已关闭")
     except Exception as e:
         logger.error(f"关闭数据库连接时出错: {e}")
 
 
-# 数据库连接池事件监听器
-@event.listens_for(engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    """数据库连接建立时的配置"""
-    # 对于MySQL，设置会话级别的配置
-    try:
-        cursor = dbapi_connection.cursor()
-        # 设置事务隔离级别为READ_COMMITTED
-        cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED")
-        # 设置自动提交为OFF
-        cursor.execute("SET SESSION autocommit = 0")
-        # 设置SQL模式
-        cursor.execute("SET SESSION sql_mode = 'STRICT_TRANS_TABLES,NO_ZERO_DATE,NO_ZERO_IN_DATE,ERROR_FOR_DIVISION_BY_ZERO'")
-        cursor.close()
-        logger.debug("MySQL会话配置已设置")
-    except Exception as e:
-        logger.warning(f"设置MySQL会话配置失败: {e}")
-
-
-@event.listens_for(engine, "checkout")
-def ping_connection(dbapi_connection, connection_record, connection_proxy):
-    """连接池检出连接时的健康检查"""
-    connection_record.info['pid'] = id(dbapi_connection)
-
-
-@event.listens_for(engine, "checkin")
-def checkin_connection(dbapi_connection, connection_record):
-    """连接池归还连接时的清理"""
-    pass
-
-
-@event.listens_for(engine, "invalidate")
-def invalidate_connection(dbapi_connection, connection_record, exception):
-    """连接失效时的处理"""
-    logger.warning(f"数据库连接失效: {exception}")
-
-
 # 数据库会话上下文管理器
 class DatabaseSessionManager:
     """数据库会话上下文管理器"""
@@ -381,9 +381,16 @@ HTTP_STATUS_CODE_MAP = {
 }
 
 
+# 模块加载时把状态码直接挂到枚举成员上，错误响应路径只需一次属性读取；
+# 未显式映射的错误码统一为 500。
+for _error_code in ErrorCode:
+    _error_code.http_status = HTTP_STATUS_CODE_MAP.get(_error_code, 500)
+del _error_code
+
+
 def get_http_status_code(error_code: ErrorCode) -> int:
     """获取错误码对应的HTTP状态码"""
-    return HTTP_STATUS_CODE_MAP.get(error_code, 500)
+    return error_code.http_status
 
 
 def create_error_response(
@@ -412,13 +419,7 @@ def handle_unexpected_error(error: Exception) -> Dict[str, Any]:
     # 记录详细的错误信息
     from app.core.logging import app_logger, log_error_with_context
     
-    log_error_with_context(
-        app_logger,
-        error,
-        "未处理的异常",
-        error_type=type(error).__name__,
-        traceback=traceback.format_exc()
-    )
+    log_error_with_context(app_logger, error, {'operation': '未处理的异常'})
     
     # 返回通用错误响应
     return create_error_response(
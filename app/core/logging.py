@@ -5,17 +5,19 @@
 为 FastAPI Web 与 DB Worker 提供统一的日志格式和配置。
 """
 
+import atexit
+import copy
 import gzip
 from contextlib import contextmanager
 import logging
 import logging.handlers
+import queue
 import sys
 import json
 import os
 import re
 import shutil
 import time
-import traceback
 from datetime import datetime, date
 from typing import Dict, Any, Optional, List
 from pathlib import Path
@@ -29,6 +31,12 @@ except ImportError:  # pragma: no cover - 仅 Windows 不提供 fcntl
 # 模块级变量用于存储上下文过滤器和性能日志记录器
 _context_filter: Optional['ContextFilter'] = None
 _performance_logger: Optional['PerformanceLogger'] = None
+# 后台日志线程：请求线程只负责入队，控制台/文件写入在该线程中完成
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+# LogRecord 自带的属性名：extra 中出现这些键时 makeRecord 会抛 KeyError
+_RESERVED_RECORD_ATTRS = frozenset(
+    logging.LogRecord('', logging.NOTSET, '', 0, '', (), None).__dict__
+) | {'message', 'asctime'}
 
 
 class GzipTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
@@ -193,6 +201,23 @@ class GzipTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
         return result[: len(result) - self.backupCount]
 
 
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """进程内队列处理器。
+
+    标准库 ``QueueHandler.prepare`` 为跨进程传输会把异常格式化进消息并
+    清空 ``exc_info``，这会让下游 ``JSONFormatter`` 丢失结构化异常字段。
+    这里的队列只在本进程内流转，因此仅提前合并消息参数，保留 ``exc_info``
+    交由真实处理器格式化。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
 class JSONFormatter(logging.Formatter):
     """JSON格式化器，输出结构化日志"""
     
@@ -333,9 +358,29 @@ def create_file_formatter() -> logging.Formatter:
     return TextFormatter()
 
 
+def stop_logging() -> None:
+    """停止后台日志线程，写完队列中剩余的日志并关闭真实处理器。"""
+    global _queue_listener
+
+    listener = _queue_listener
+    if listener is None:
+        return
+    _queue_listener = None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
 def setup_logging() -> None:
-    """设置日志系统"""
-    global _context_filter, _performance_logger
+    """设置日志系统
+
+    根日志器只挂载 ``LocalQueueHandler``，控制台与文件处理器由后台
+    ``QueueListener`` 线程驱动，日志调用在请求线程上只是一次入队。
+    重复调用会先停止上一轮的后台线程。
+    """
+    global _context_filter, _performance_logger, _queue_listener
+
+    stop_logging()
     
     # 创建上下文过滤器
     context_filter = ContextFilter()
@@ -354,14 +399,14 @@ def setup_logging() -> None:
         root_logger.removeHandler(handler)
 
     console_formatter = create_formatter()
+    handlers: List[logging.Handler] = []
     
     # 控制台处理器。部署脚本关闭它，避免应用日志再被重定向到未轮转的
     # *.startup.log；本地开发和容器采集场景保持默认开启。
     if settings.LOG_CONSOLE_ENABLED:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(console_formatter)
-        console_handler.addFilter(context_filter)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # 文件处理器：按日轮转 + gzip 压缩 + 按 backupCount 保留
     if settings.LOG_FILE_PATH:
@@ -379,8 +424,7 @@ def setup_logging() -> None:
                 utc=False,
             )
             file_handler.setFormatter(create_file_formatter())
-            file_handler.addFilter(context_filter)
-            root_logger.addHandler(file_handler)
+            handlers.append(file_handler)
 
             # 启动时若当前日志仍是跨日之前的内容，走 handler 轮转（含 gzip）
             if log_file_path.exists():
@@ -392,6 +436,18 @@ def setup_logging() -> None:
                 f"文件日志设置失败: {e}",
                 extra={'extra_data': {'error': str(e)}}
             )
+
+    if handlers:
+        log_queue = queue.SimpleQueue()
+        queue_handler = LocalQueueHandler(log_queue)
+        # 上下文由 log_with_context 在调用线程上设置后立即清除，
+        # 过滤器必须在入队前执行，不能挂到后台线程的处理器上。
+        queue_handler.addFilter(context_filter)
+        root_logger.addHandler(queue_handler)
+        _queue_listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _queue_listener.start()
     
     # 设置第三方库日志级别（高频噪音默认压到 WARNING）
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -441,8 +497,8 @@ def setup_third_party_logging() -> None:
     # 无论环境，都避免 sqlfluff 解析树刷屏
     logging.getLogger('sqlfluff').setLevel(logging.WARNING)
     
-    # SQL 语句仅在显式开启 DATABASE_ECHO 时输出
-    if settings.DATABASE_ECHO:
+    # SQL 语句仅在非生产环境显式开启 DATABASE_ECHO 时输出
+    if settings.DATABASE_ECHO and not settings.is_production():
         logging.getLogger('sqlalchemy.engine').setLevel(logging.INFO)
     else:
         logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
@@ -490,28 +546,48 @@ def log_task_event(logger: logging.Logger, event: str, task_id: str, job_id: str
 
 
 def log_error_with_context(logger: logging.Logger, error: Exception, context: Dict[str, Any]):
-    """记录带上下文的错误"""
-    log_with_context(
-        logger, 'error', f"Error occurred: {str(error)}",
-        error_type=type(error).__name__,
-        error_message=str(error),
-        traceback=traceback.format_exc(),
-        **context
-    )
+    """记录带上下文的错误
+
+    堆栈通过 ``exc_info`` 交给处理器格式化：日志被级别过滤时不会遍历栈帧，
+    真正输出时由 ``JSONFormatter``/``TextFormatter`` 统一渲染。
+    与 LogRecord 属性同名的上下文键加 ``context_`` 前缀，避免记录错误时再抛异常。
+    """
+    extra = {
+        'error_type': type(error).__name__,
+        'error_message': str(error),
+    }
+    _merge_context_extra(extra, context)
+    logger.error(f"Error occurred: {error}", exc_info=error, extra=extra)
+
+
+def _merge_context_extra(extra: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """把调用方字段并入 extra，与 LogRecord 属性同名的键加 ``context_`` 前缀"""
+    for key, value in context.items():
+        if key in _RESERVED_RECORD_ATTRS:
+            key = f'context_{key}'
+        extra[key] = value
+    return extra
 
 
 def log_performance_metric(metric_name: str, value: float, unit: str = "ms", **labels):
-    """记录性能指标"""
-    if _performance_logger is not None:
-        logger = logging.getLogger("performance")
-        log_with_context(
-            logger, 'info', f"Performance metric: {metric_name}",
-            metric_name=metric_name,
-            metric_value=value,
-            metric_unit=unit,
-            event_type='performance_metric',
-            **labels
-        )
+    """记录性能指标
+
+    指标字段直接作为 ``extra`` 写入日志记录，不经过 ``log_with_context``
+    的上下文设置/清除；performance 日志器未开启 INFO 时直接返回。
+    """
+    if _performance_logger is None:
+        return
+    logger = _performance_logger.logger
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    extra = {
+        'metric_name': metric_name,
+        'metric_value': value,
+        'metric_unit': unit,
+        'event_type': 'performance_metric',
+    }
+    # 标签名与 LogRecord 属性（name/module/args 等）同名时加前缀，避免 makeRecord 抛 KeyError
+    logger.info(f"Performance metric: {metric_name}", extra=_merge_context_extra(extra, labels))
 
 
 # 预定义的日志记录器
@@ -524,5 +600,6 @@ file_logger = get_logger('file')
 service_logger = get_logger('service')
 
 
-# 模块加载时自动设置日志
+# 模块加载时自动设置日志；进程退出前写完队列中的日志
 setup_logging()
+atexit.register(stop_logging)
@@ -3,14 +3,30 @@ Prometheus监控指标
 提供系统性能监控和业务指标收集
 """
 
-from prometheus_client import Counter, Histogram, Gauge, start_http_server, generate_latest
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    Gauge,
+    start_http_server,
+    generate_latest,
+)
+import os
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from functools import wraps
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+# Gunicorn 多 worker 下每个进程各有一份内存指标，抓取只会命中其中一个进程。
+# 设置 PROMETHEUS_MULTIPROC_DIR 后 prometheus_client 将指标写入共享目录，
+# 由 get_metrics() 通过 MultiProcessCollector 聚合所有进程的数据。
+# Gauge 使用 livemostrecent：只取存活进程的最新值，worker 退出后由 Gunicorn
+# child_exit 钩子（scripts/gunicorn_conf.py）调用 mark_process_dead 清理其文件。
+PROMETHEUS_MULTIPROC_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
 # 定义监控指标
 # 请求相关指标
 request_counter = Counter(
@@ -47,30 +63,36 @@ task_status_counter = Counter(
 # 系统状态指标
 active_jobs = Gauge(
     'sql_linting_active_jobs',
-    'Number of active jobs'
+    'Number of active jobs',
+    multiprocess_mode='livemostrecent',
 )
 
 active_tasks = Gauge(
     'sql_linting_active_tasks',
-    'Number of active tasks'
+    'Number of active tasks',
+    multiprocess_mode='livemostrecent',
 )
 
 # DB Queue gauges (low cardinality)
 pending_task_count = Gauge(
     'sql_linting_pending_task_count',
     'Number of PENDING tasks ready to claim',
+    multiprocess_mode='livemostrecent',
 )
 in_progress_task_count = Gauge(
     'sql_linting_in_progress_task_count',
     'Number of IN_PROGRESS tasks',
+    multiprocess_mode='livemostrecent',
 )
 oldest_pending_age_seconds = Gauge(
     'sql_linting_oldest_pending_age_seconds',
     'Age in seconds of the oldest claimable PENDING task',
+    multiprocess_mode='livemostrecent',
 )
 active_worker_count = Gauge(
     'sql_linting_active_worker_count',
     'Number of RUNNING workers with fresh heartbeat',
+    multiprocess_mode='livemostrecent',
 )
 
 # DB Queue counters
@@ -131,12 +153,14 @@ error_counter = Counter(
 # 资源使用指标
 memory_usage = Gauge(
     'sql_linting_memory_usage_bytes',
-    'Memory usage in bytes'
+    'Memory usage in bytes',
+    multiprocess_mode='livemostrecent',
 )
 
 disk_usage = Gauge(
     'sql_linting_disk_usage_bytes',
-    'Disk usage in bytes'
+    'Disk usage in bytes',
+    multiprocess_mode='livemostrecent',
 )
 
 
@@ -146,14 +170,17 @@ def collect_queue_gauges(db: Session, *, worker_heartbeat_seconds: int = 90) ->
     from app.schemas.common import TaskStatusEnum
 
     now = datetime.utcnow()
-    pending = db.query(LintingTask).filter(
-        LintingTask.status == TaskStatusEnum.PENDING
-    ).count()
-    in_progress = db.query(LintingTask).filter(
-        LintingTask.status == TaskStatusEnum.IN_PROGRESS
-    ).count()
-    pending_task_count.set(pending)
-    in_progress_task_count.set(in_progress)
+    # 一次 GROUP BY 同时取 PENDING / IN_PROGRESS 计数
+    counts = dict(
+        db.query(LintingTask.status, func.count(LintingTask.id))
+        .filter(LintingTask.status.in_([
+            TaskStatusEnum.PENDING.value, TaskStatusEnum.IN_PROGRESS.value
+        ]))
+        .group_by(LintingTask.status)
+        .all()
+    )
+    pending_task_count.set(counts.get(TaskStatusEnum.PENDING.value, 0))
+    in_progress_task_count.set(counts.get(TaskStatusEnum.IN_PROGRESS.value, 0))
 
     oldest = (
         db.query(LintingTask.created_at)
@@ -227,8 +254,23 @@ def start_metrics_server(port: int = 8001):
     print(f"Metrics server started on port {port}")
 
 
+def is_multiprocess_mode() -> bool:
+    """是否启用了 prometheus_client 多进程模式"""
+    return bool(os.environ.get(PROMETHEUS_MULTIPROC_DIR_ENV))
+
+
 def get_metrics():
-    """获取所有监控指标"""
+    """获取所有监控指标
+
+    多进程模式下每次抓取构建临时 registry 聚合各 worker 的指标文件，
+    否则直接导出当前进程的默认 registry。
+    """
+    if is_multiprocess_mode():
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
     return generate_latest()
 
 
@@ -291,32 +333,22 @@ def update_disk_usage(bytes_used: int):
 
 
 def metrics_decorator(metric_func):
-    """监控装饰器，用于包装函数并记录性能指标"""
+    """监控装饰器，用于包装函数并记录性能指标
+
+    耗时使用单调时钟 ``time.perf_counter()``，不受系统时间校准影响。
+    """
     def decorator(func):
+        component = func.__module__
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
-                duration = time.time() - start_time
-                metric_func(duration)
-                return result
             except Exception as e:
-                record_error(type(e).__name__, func.__module__)
+                record_error(type(e).__name__, component)
                 raise
+            metric_func(time.perf_counter() - start_time)
+            return result
         return wrapper
     return decorator
-
-
-sql_analysis_metrics = metrics_decorator(
-    lambda duration: sql_analysis_duration.labels(
-        file_size="unknown",
-        dialect="unknown"
-    ).observe(duration)
-)
-
-zip_processing_metrics = metrics_decorator(
-    lambda duration: zip_processing_duration.labels(
-        file_count="unknown"
-    ).observe(duration)
-)
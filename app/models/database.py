@@ -5,18 +5,20 @@
 包含表结构、关系、索引和约束定义。
 """
 
-from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Enum, ForeignKey, Index, JSON, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Enum, ForeignKey, Index, JSON, Boolean, FetchedValue
+from sqlalchemy.orm import relationship, object_session
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.mysql import DATETIME as MYSQL_DATETIME
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from app.core.database import Base
 
 
 # MySQL 使用 DATETIME(6)；SQLite 等其它方言回退到普通 DateTime
 DateTime6 = DateTime().with_variant(MYSQL_DATETIME(fsp=6), "mysql")
+# MySQL 使用 BIGINT 自增主键；SQLite 只有 INTEGER PRIMARY KEY 会自增，回退为 Integer
+BigIntegerPK = BigInteger().with_variant(Integer, "sqlite")
 
 
 class RuleDefinition(Base):
@@ -162,6 +164,9 @@ class LintingJob(Base):
         nullable=False,
         default=func.now(),
         onupdate=func.now(),
+        server_default=func.now(),
+        # 库表上为 ON UPDATE CURRENT_TIMESTAMP(6)，由 MySQL 维护（见 updated_at_on_update_001 迁移）
+        server_onupdate=FetchedValue(),
         comment="最后更新时间"
     )
     
@@ -169,8 +174,7 @@ class LintingJob(Base):
     tasks = relationship(
         "LintingTask",
         back_populates="job",
-        cascade="all, delete-orphan",  # 级联删除
-        lazy="dynamic"  # 延迟加载，返回Query对象
+        cascade="all, delete-orphan"  # 级联删除
     )
     
     def __repr__(self):
@@ -208,17 +212,14 @@ class LintingJob(Base):
         """检查工作是否正在处理中"""
         return self.status == 'PROCESSING'
     
-    def get_task_count(self) -> int:
-        """获取任务总数"""
-        return self.tasks.count()
-    
-    def get_successful_task_count(self) -> int:
-        """获取成功任务数"""
-        return self.tasks.filter(LintingTask.status == 'SUCCESS').count()
-    
-    def get_failed_task_count(self) -> int:
-        """获取失败任务数"""
-        return self.tasks.filter(LintingTask.status == 'FAILURE').count()
+    def get_task_status_counts(self) -> Dict[str, int]:
+        """
+        按状态统计任务数（单次 GROUP BY 查询）
+
+        总数/成功/失败均由返回的 {status: count} 派生；多个Job请使用
+        JobQueryHelper.get_task_status_counts_by_jobs，避免逐个Job查询。
+        """
+        return JobQueryHelper.get_task_status_counts(object_session(self), self.job_id)
 
 
 class LintingTask(Base):
@@ -414,6 +415,9 @@ class LintingTask(Base):
         nullable=False,
         default=func.now(),
         onupdate=func.now(),
+        server_default=func.now(),
+        # 库表上为 ON UPDATE CURRENT_TIMESTAMP(6)，由 MySQL 维护（见 updated_at_on_update_001 迁移）
+        server_onupdate=FetchedValue(),
         comment="最后更新时间"
     )
 
@@ -489,6 +493,7 @@ class LintingTask(Base):
 # 为了优化查询性能，创建复合索引
 
 # Job表索引
+Index('idx_job_created', LintingJob.created_at)
 Index('idx_job_status_created', LintingJob.status, LintingJob.created_at)
 Index('idx_job_type_status', LintingJob.submission_type, LintingJob.status)
 Index('idx_job_user_status', LintingJob.user_id, LintingJob.status)
@@ -504,6 +509,7 @@ Index('idx_job_boc_task_created', LintingJob.boc_task_number, LintingJob.created
 Index('idx_task_job_status', LintingTask.job_id, LintingTask.status)
 Index('idx_task_status_created', LintingTask.status, LintingTask.created_at)
 Index('idx_task_job_created', LintingTask.job_id, LintingTask.created_at)
+Index('idx_task_status_job_created', LintingTask.status, LintingTask.job_id, LintingTask.created_at)
 Index(
     'idx_task_lease_claim',
     LintingTask.status,
@@ -529,19 +535,8 @@ def validate_task_status_transition(mapper, connection, target):
         pass
 
 
-# 事件监听器（如果需要的话）
-from sqlalchemy import event
-
-@event.listens_for(LintingJob, 'before_update')
-def job_before_update(mapper, connection, target):
-    """Job更新前的处理"""
-    target.updated_at = func.now()
-
-
-@event.listens_for(LintingTask, 'before_update')
-def task_before_update(mapper, connection, target):
-    """Task更新前的处理"""
-    target.updated_at = func.now()
+# updated_at 由列上的 onupdate=func.now() 写入 UPDATE 语句（ORM flush 与 Query.update
+# 均生效），MySQL 侧另有 ON UPDATE CURRENT_TIMESTAMP(6) 兜底，无需逐行 before_update 回调
 
 
 # 批量操作辅助函数
@@ -569,6 +564,32 @@ class JobQueryHelper:
             LintingJob.created_at >= start_date,
             LintingJob.created_at <= end_date
         )
+    
+    @staticmethod
+    def get_task_status_counts(session, job_id) -> Dict[str, int]:
+        """按状态统计某个Job下的Task数量"""
+        return dict(
+            session.query(LintingTask.status, func.count(LintingTask.id))
+            .filter(LintingTask.job_id == job_id)
+            .group_by(LintingTask.status)
+            .all()
+        )
+    
+    @staticmethod
+    def get_task_status_counts_by_jobs(session, job_ids) -> Dict[str, Dict[str, int]]:
+        """一次 GROUP BY 统计多个Job下各状态的Task数量，返回 {job_id: {status: count}}"""
+        counts: Dict[str, Dict[str, int]] = {job_id: {} for job_id in job_ids}
+        if not counts:
+            return counts
+        rows = (
+            session.query(LintingTask.job_id, LintingTask.status, func.count(LintingTask.id))
+            .filter(LintingTask.job_id.in_(list(counts)))
+            .group_by(LintingTask.job_id, LintingTask.status)
+            .all()
+        )
+        for job_id, status, count in rows:
+            counts[job_id][status] = count
+        return counts
 
 
 class TaskQueryHelper:
@@ -594,6 +615,15 @@ class TaskQueryHelper:
         return session.query(LintingTask).filter(
             LintingTask.status == 'FAILURE'
         )
+    
+    @staticmethod
+    def bulk_update_tasks(session, task_ids, values) -> int:
+        """按 task_id 批量更新Task，合并为单条 UPDATE（updated_at 由 onupdate 写入）"""
+        if not task_ids:
+            return 0
+        return session.query(LintingTask).filter(
+            LintingTask.task_id.in_(task_ids)
+        ).update(values, synchronize_session=False)
 
 
 class WorkerRegistry(Base):
@@ -673,7 +703,7 @@ class LintingViolation(Base):
     __tablename__ = "linting_violations"
     
     # 主键
-    id = Column(BigInteger, primary_key=True, autoincrement=True, comment="自增主键")
+    id = Column(BigIntegerPK, primary_key=True, autoincrement=True, comment="自增主键")
     
     # 关联字段
     task_id = Column(
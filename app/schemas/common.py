@@ -5,7 +5,7 @@
 用于API请求和响应的数据验证和序列化。
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional, List, TypeVar, Generic, Any, Dict
 from datetime import datetime
 from enum import Enum
@@ -19,11 +19,6 @@ class BaseResponse(BaseModel):
     success: bool = Field(default=True, description="请求是否成功")
     message: Optional[str] = Field(default=None, description="响应消息")
     timestamp: datetime = Field(default_factory=datetime.now, description="响应时间戳")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class ErrorResponse(BaseResponse):
@@ -37,18 +32,6 @@ class PaginationParams(BaseModel):
     """分页参数模型"""
     page: int = Field(default=1, ge=1, description="页码，从1开始")
     size: int = Field(default=10, ge=1, le=100, description="每页大小，最大100")
-    
-    @validator('page')
-    def validate_page(cls, v):
-        if v < 1:
-            raise ValueError('页码必须大于0')
-        return v
-    
-    @validator('size')
-    def validate_size(cls, v):
-        if v < 1 or v > 100:
-            raise ValueError('每页大小必须在1-100之间')
-        return v
 
 
 class PaginationResponse(BaseModel, Generic[T]):
@@ -60,26 +43,6 @@ class PaginationResponse(BaseModel, Generic[T]):
     has_next: bool = Field(description="是否有下一页")
     has_prev: bool = Field(description="是否有上一页")
     items: List[T] = Field(description="当前页数据")
-    
-    @validator('pages', pre=True, always=True)
-    def calculate_pages(cls, v, values):
-        """计算总页数"""
-        total = values.get('total', 0)
-        size = values.get('size', 10)
-        return (total + size - 1) // size if total > 0 else 0
-    
-    @validator('has_next', pre=True, always=True)
-    def calculate_has_next(cls, v, values):
-        """计算是否有下一页"""
-        page = values.get('page', 1)
-        pages = values.get('pages', 0)
-        return page < pages
-    
-    @validator('has_prev', pre=True, always=True)
-    def calculate_has_prev(cls, v, values):
-        """计算是否有上一页"""
-        page = values.get('page', 1)
-        return page > 1
 
 
 class StatusEnum(str, Enum):
@@ -125,11 +88,6 @@ class HealthCheckResponse(BaseModel):
     database: bool = Field(description="数据库连接状态")
     workers: bool = Field(description="Worker 运行状态")
     nfs: bool = Field(description="NFS存储状态")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class ValidationErrorResponse(BaseModel):
@@ -164,30 +122,35 @@ def create_pagination_response(
     page: int,
     size: int
 ) -> PaginationResponse[T]:
-    """创建分页响应"""
-    return PaginationResponse(
+    """创建分页响应（服务端已校验的数据，直接构造不再校验）"""
+    pages = -(-total // size) if total > 0 else 0
+    return PaginationResponse.model_construct(
         items=items,
         total=total,
         page=page,
         size=size,
-        pages=(total + size - 1) // size if total > 0 else 0,
-        has_next=page < ((total + size - 1) // size if total > 0 else 0),
+        pages=pages,
+        has_next=page < pages,
         has_prev=page > 1
     )
 
 
 # 通用查询参数
+_ALLOWED_SORT_FIELDS = frozenset({'created_at', 'updated_at', 'status'})
+_ALLOWED_SORT_FIELDS_STR = "created_at, updated_at, status"
+
+
 class BaseQueryParams(BaseModel):
     """基础查询参数"""
     sort_by: Optional[str] = Field(default="created_at", description="排序字段")
     sort_order: SortOrderEnum = Field(default=SortOrderEnum.DESC, description="排序方向")
     
-    @validator('sort_by')
+    @field_validator('sort_by')
+    @classmethod
     def validate_sort_by(cls, v):
         # 可以在这里验证允许的排序字段
-        allowed_fields = ['created_at', 'updated_at', 'status']
-        if v and v not in allowed_fields:
-            raise ValueError(f'排序字段必须是以下之一: {", ".join(allowed_fields)}')
+        if v and v not in _ALLOWED_SORT_FIELDS:
+            raise ValueError(f'排序字段必须是以下之一: {_ALLOWED_SORT_FIELDS_STR}')
         return v
 
 
@@ -196,12 +159,11 @@ class DateRangeParams(BaseModel):
     start_date: Optional[datetime] = Field(default=None, description="开始日期")
     end_date: Optional[datetime] = Field(default=None, description="结束日期")
     
-    @validator('end_date')
-    def validate_date_range(cls, v, values):
-        start_date = values.get('start_date')
-        if start_date and v and v <= start_date:
+    @model_validator(mode='after')
+    def validate_date_range(self):
+        if self.start_date and self.end_date and self.end_date <= self.start_date:
             raise ValueError('结束日期必须大于开始日期')
-        return v
+        return self
 
 
 # 响应数据包装器
@@ -5,8 +5,11 @@ Job相关API数据模型
 包括创建请求、查询响应等模型定义。
 """
 
-from pydantic import BaseModel, Field, validator, model_validator
-from typing import Optional, List
+import sys
+
+from pydantic import BaseModel, Field, field_validator, ConfigDict
+from typing import Optional, List, Dict, Tuple, FrozenSet
+from functools import lru_cache
 from datetime import datetime
 from fastapi import Form, UploadFile, File
 
@@ -19,6 +22,46 @@ from app.schemas.common import (
 )
 
 
+# 如果动态获取失败，使用常见的方言作为fallback
+_FALLBACK_DIALECTS = frozenset({
+    'ansi', 'mysql', 'postgres', 'postgresql', 'sqlite', 'bigquery',
+    'snowflake', 'redshift', 'oracle', 'tsql', 'hive', 'spark',
+    'teradata', 'exasol', 'db2', 'duckdb', 'gbase8a', 'mariadb',
+    'clickhouse', 'databricks', 'athena', 'greenplum',
+    'materializ', 'impala', 'soql', 'sparksql', 'starrocks',
+    'trino', 'vertica'
+})
+
+_JOB_SORT_FIELDS = frozenset({'created_at', 'updated_at', 'user_id', 'product_name', 'status'})
+_JOB_SEARCH_SORT_FIELDS = _JOB_SORT_FIELDS | {'submission_type'}
+
+
+@lru_cache(maxsize=1)
+def _supported_dialects() -> Tuple[FrozenSet[str], str]:
+    """SQLFluff支持的方言集合及其排序后的展示串，进程内只计算一次"""
+    # 动态获取SQLFluff支持的方言列表
+    try:
+        from app.services.sqlfluff_service import SQLFluffService
+        dialects = frozenset(SQLFluffService().get_supported_dialects())
+    except Exception:
+        dialects = _FALLBACK_DIALECTS
+    return dialects, ', '.join(sorted(dialects))
+
+
+def _validate_dialect(v: Optional[str]) -> Optional[str]:
+    """校验并规范化方言名称"""
+    if v is not None:
+        v = v.strip().lower()
+        if not v:
+            raise ValueError("方言不能为空")
+        supported_dialects, supported_str = _supported_dialects()
+        if v not in supported_dialects:
+            raise ValueError(f"不支持的方言: {v}，支持的方言包括: {supported_str}")
+        # 方言取值集合很小，驻留后各请求共用同一字符串对象，作为 Linter 缓存键比较更快
+        v = sys.intern(v)
+    return v
+
+
 class JobCreateRequest(BaseModel):
     """创建核验工作请求模型"""
     sql_content: Optional[str] = Field(
@@ -27,6 +70,7 @@ class JobCreateRequest(BaseModel):
     )
     zip_file_path: Optional[str] = Field(
         default=None,
+        validate_default=True,  # 未传时也要执行二选一校验
         description="ZIP包在NFS中的相对路径（与sql_content二选一）"
     )
     dialect: Optional[str] = Field(
@@ -53,23 +97,8 @@ class JobCreateRequest(BaseModel):
         description="SQLFluff规则列表，如['RF02', 'L032']，如果为空则使用默认规则"
     )
     
-    @model_validator(mode='after')
-    def validate_request(self):
-        """验证请求参数"""
-        sql_content = self.sql_content
-        zip_file_path = self.zip_file_path
-        
-        # 必须提供其中一个
-        if not sql_content and not zip_file_path:
-            raise ValueError("必须提供 sql_content 或 zip_file_path 其中之一")
-        
-        # 不能同时提供两个
-        if sql_content and zip_file_path:
-            raise ValueError("sql_content 和 zip_file_path 不能同时提供")
-        
-        return self
-    
-    @validator('sql_content')
+    @field_validator('sql_content')
+    @classmethod
     def validate_sql_content(cls, v):
         """验证SQL内容"""
         if v is not None:
@@ -80,9 +109,10 @@ class JobCreateRequest(BaseModel):
                 raise ValueError("SQL内容不能超过1MB")
         return v
     
-    @validator('zip_file_path')
-    def validate_zip_file_path(cls, v):
-        """验证ZIP文件路径"""
+    @field_validator('zip_file_path')
+    @classmethod
+    def validate_zip_file_path(cls, v, info):
+        """验证ZIP文件路径，并校验与 sql_content 二选一"""
         if v is not None:
             v = v.strip()
             if not v:
@@ -91,37 +121,26 @@ class JobCreateRequest(BaseModel):
                 raise ValueError("文件必须是ZIP格式")
             if len(v) > 1024:
                 raise ValueError("文件路径不能超过1024字符")
+        
+        # sql_content 自身校验失败时不在 info.data 中，由其字段错误报告
+        if 'sql_content' in info.data:
+            sql_content = info.data['sql_content']
+            # 必须提供其中一个
+            if not sql_content and not v:
+                raise ValueError("必须提供 sql_content 或 zip_file_path 其中之一")
+            # 不能同时提供两个
+            if sql_content and v:
+                raise ValueError("sql_content 和 zip_file_path 不能同时提供")
         return v
     
-    @validator('dialect')
+    @field_validator('dialect')
+    @classmethod
     def validate_dialect(cls, v):
         """验证SQLFluff方言"""
-        if v is not None:
-            v = v.strip().lower()
-            if not v:
-                raise ValueError("方言不能为空")
-            
-            # 动态获取SQLFluff支持的方言列表
-            try:
-                from app.services.sqlfluff_service import SQLFluffService
-                service = SQLFluffService()
-                supported_dialects = set(service.get_supported_dialects())
-            except Exception:
-                # 如果动态获取失败，使用常见的方言作为fallback
-                supported_dialects = {
-                    'ansi', 'mysql', 'postgres', 'postgresql', 'sqlite', 'bigquery', 
-                    'snowflake', 'redshift', 'oracle', 'tsql', 'hive', 'spark',
-                    'teradata', 'exasol', 'db2', 'duckdb', 'gbase8a', 'mariadb',
-                    'clickhouse', 'databricks', 'athena', 'duckdb', 'greenplum',
-                    'materializ', 'impala', 'soql', 'sparksql', 'starrocks', 
-                    'trino', 'vertica'
-                }
-            
-            if v not in supported_dialects:
-                raise ValueError(f"不支持的方言: {v}，支持的方言包括: {', '.join(sorted(supported_dialects))}")
-        return v
+        return _validate_dialect(v)
     
-    @validator('user_id')
+    @field_validator('user_id')
+    @classmethod
     def validate_user_id(cls, v):
         """验证用户ID"""
         if not v or not v.strip():
@@ -131,7 +150,8 @@ class JobCreateRequest(BaseModel):
             raise ValueError("用户ID不能超过255字符")
         return v
     
-    @validator('product_name')
+    @field_validator('product_name')
+    @classmethod
     def validate_product_name(cls, v):
         """验证产品名称"""
         if not v or not v.strip():
@@ -141,7 +161,8 @@ class JobCreateRequest(BaseModel):
             raise ValueError("产品名称不能超过255字符")
         return v
     
-    @validator('boc_batch_number')
+    @field_validator('boc_batch_number')
+    @classmethod
     def validate_boc_batch_number(cls, v):
         """验证BOC批次号"""
         if v is not None:
@@ -152,7 +173,8 @@ class JobCreateRequest(BaseModel):
                 raise ValueError("BOC批次号不能超过255字符")
         return v
     
-    @validator('boc_task_number')
+    @field_validator('boc_task_number')
+    @classmethod
     def validate_boc_task_number(cls, v):
         """验证BOC任务号"""
         if v is not None:
@@ -163,7 +185,8 @@ class JobCreateRequest(BaseModel):
                 raise ValueError("BOC任务号不能超过255字符")
         return v
 
-    @validator('rules')
+    @field_validator('rules')
+    @classmethod
     def validate_rules(cls, v):
         """验证SQLFluff规则列表"""
         if v is not None:
@@ -213,7 +236,8 @@ class JobCreateFromExtractedRequest(BaseModel):
         description="SQLFluff规则列表，如['RF02', 'L032']，如果为空则使用默认规则"
     )
     
-    @validator('extracted_folder_path')
+    @field_validator('extracted_folder_path')
+    @classmethod
     def validate_extracted_folder_path(cls, v):
         """验证解压后文件夹路径"""
         if not v or not v.strip():
@@ -223,35 +247,14 @@ class JobCreateFromExtractedRequest(BaseModel):
             raise ValueError("文件夹路径不能超过1024字符")
         return v
     
-    @validator('dialect')
+    @field_validator('dialect')
+    @classmethod
     def validate_dialect(cls, v):
         """验证SQLFluff方言"""
-        if v is not None:
-            v = v.strip().lower()
-            if not v:
-                raise ValueError("方言不能为空")
-            
-            # 动态获取SQLFluff支持的方言列表
-            try:
-                from app.services.sqlfluff_service import SQLFluffService
-                service = SQLFluffService()
-                supported_dialects = set(service.get_supported_dialects())
-            except Exception:
-                # 如果动态获取失败，使用常见的方言作为fallback
-                supported_dialects = {
-                    'ansi', 'mysql', 'postgres', 'postgresql', 'sqlite', 'bigquery', 
-                    'snowflake', 'redshift', 'oracle', 'tsql', 'hive', 'spark',
-                    'teradata', 'exasol', 'db2', 'duckdb', 'gbase8a', 'mariadb',
-                    'clickhouse', 'databricks', 'athena', 'duckdb', 'greenplum',
-                    'materializ', 'impala', 'soql', 'sparksql', 'starrocks', 
-                    'trino', 'vertica'
-                }
-            
-            if v not in supported_dialects:
-                raise ValueError(f"不支持的方言: {v}，支持的方言包括: {', '.join(sorted(supported_dialects))}")
-        return v
+        return _validate_dialect(v)
     
-    @validator('user_id')
+    @field_validator('user_id')
+    @classmethod
     def validate_user_id(cls, v):
         """验证用户ID"""
         if not v or not v.strip():
@@ -261,7 +264,8 @@ class JobCreateFromExtractedRequest(BaseModel):
             raise ValueError("用户ID不能超过255字符")
         return v
     
-    @validator('product_name')
+    @field_validator('product_name')
+    @classmethod
     def validate_product_name(cls, v):
         """验证产品名称"""
         if not v or not v.strip():
@@ -271,7 +275,8 @@ class JobCreateFromExtractedRequest(BaseModel):
             raise ValueError("产品名称不能超过255字符")
         return v
     
-    @validator('boc_batch_number')
+    @field_validator('boc_batch_number')
+    @classmethod
     def validate_boc_batch_number(cls, v):
         """验证BOC批次号"""
         if v is not None:
@@ -282,7 +287,8 @@ class JobCreateFromExtractedRequest(BaseModel):
                 raise ValueError("BOC批次号不能超过255字符")
         return v
     
-    @validator('boc_task_number')
+    @field_validator('boc_task_number')
+    @classmethod
     def validate_boc_task_number(cls, v):
         """验证BOC任务号"""
         if v is not None:
@@ -293,7 +299,8 @@ class JobCreateFromExtractedRequest(BaseModel):
                 raise ValueError("BOC任务号不能超过255字符")
         return v
 
-    @validator('rules')
+    @field_validator('rules')
+    @classmethod
     def validate_rules(cls, v):
         """验证SQLFluff规则列表"""
         if v is not None:
@@ -344,7 +351,8 @@ class JobCreateWithUploadRequest(BaseModel):
         description="SQLFluff规则列表，如['RF02', 'L032']，如果为空则使用默认规则"
     )
     
-    @validator('sql_content')
+    @field_validator('sql_content')
+    @classmethod
     def validate_sql_content(cls, v):
         """验证SQL内容"""
         if v is not None:
@@ -355,35 +363,14 @@ class JobCreateWithUploadRequest(BaseModel):
                 raise ValueError("SQL内容不能超过1MB")
         return v
     
-    @validator('dialect')
+    @field_validator('dialect')
+    @classmethod
     def validate_dialect(cls, v):
         """验证SQLFluff方言"""
-        if v is not None:
-            v = v.strip().lower()
-            if not v:
-                raise ValueError("方言不能为空")
-            
-            # 动态获取SQLFluff支持的方言列表
-            try:
-                from app.services.sqlfluff_service import SQLFluffService
-                service = SQLFluffService()
-                supported_dialects = set(service.get_supported_dialects())
-            except Exception:
-                # 如果动态获取失败，使用常见的方言作为fallback
-                supported_dialects = {
-                    'ansi', 'mysql', 'postgres', 'postgresql', 'sqlite', 'bigquery', 
-                    'snowflake', 'redshift', 'oracle', 'tsql', 'hive', 'spark',
-                    'teradata', 'exasol', 'db2', 'duckdb', 'gbase8a', 'mariadb',
-                    'clickhouse', 'databricks', 'athena', 'duckdb', 'greenplum',
-                    'materializ', 'impala', 'soql', 'sparksql', 'starrocks', 
-                    'trino', 'vertica'
-                }
-            
-            if v not in supported_dialects:
-                raise ValueError(f"不支持的方言: {v}，支持的方言包括: {', '.join(sorted(supported_dialects))}")
-        return v
+        return _validate_dialect(v)
     
-    @validator('user_id')
+    @field_validator('user_id')
+    @classmethod
     def validate_user_id(cls, v):
         """验证用户ID"""
         if not v or not v.strip():
@@ -393,7 +380,8 @@ class JobCreateWithUploadRequest(BaseModel):
             raise ValueError("用户ID不能超过255字符")
         return v
     
-    @validator('product_name')
+    @field_validator('product_name')
+    @classmethod
     def validate_product_name(cls, v):
         """验证产品名称"""
         if not v or not v.strip():
@@ -403,7 +391,8 @@ class JobCreateWithUploadRequest(BaseModel):
             raise ValueError("产品名称不能超过255字符")
         return v
     
-    @validator('boc_batch_number')
+    @field_validator('boc_batch_number')
+    @classmethod
     def validate_boc_batch_number(cls, v):
         """验证BOC批次号"""
         if v is not None:
@@ -414,7 +403,8 @@ class JobCreateWithUploadRequest(BaseModel):
                 raise ValueError("BOC批次号不能超过255字符")
         return v
     
-    @validator('boc_task_number')
+    @field_validator('boc_task_number')
+    @classmethod
     def validate_boc_task_number(cls, v):
         """验证BOC任务号"""
         if v is not None:
@@ -425,7 +415,8 @@ class JobCreateWithUploadRequest(BaseModel):
                 raise ValueError("BOC任务号不能超过255字符")
         return v
 
-    @validator('rules')
+    @field_validator('rules')
+    @classmethod
     def validate_rules(cls, v):
         """验证SQLFluff规则列表"""
         if v is not None:
@@ -450,12 +441,13 @@ class JobCreateResponse(BaseModel):
     """创建核验工作响应模型"""
     job_id: str = Field(description="工作ID")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "job_id": "job-d8b8a7e0-4f7f-4f7b-8f1e-8e6a1e8e6a1e"
             }
         }
+    )
 
 
 class JobSummary(BaseModel):
@@ -477,11 +469,30 @@ class JobSummary(BaseModel):
     failed_tasks: int = Field(description="失败任务数")
     error_message: Optional[str] = Field(default=None, description="错误消息")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        schema_extra = {
+    @classmethod
+    def from_row(cls, job, status_counts: Dict[str, int]) -> "JobSummary":
+        """由数据库中的 LintingJob 构造摘要，数据可信，跳过逐字段校验"""
+        return cls.model_construct(
+            job_id=job.job_id,
+            status=JobStatusEnum(job.status),
+            submission_type=SubmissionTypeEnum(job.submission_type),
+            source_path=job.source_path,
+            dialect=job.dialect,
+            user_id=job.user_id,
+            product_name=job.product_name,
+            boc_batch_number=job.boc_batch_number,
+            boc_task_number=job.boc_task_number,
+            rules=job.rules,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+            task_count=sum(status_counts.values()),
+            successful_tasks=status_counts.get('SUCCESS', 0),
+            failed_tasks=status_counts.get('FAILURE', 0),
+            error_message=job.error_message
+        )
+    
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "job_id": "job-d8b8a7e0-4f7f-4f7b-8f1e-8e6a1e8e6a1e",
                 "status": "PROCESSING",
@@ -497,6 +508,7 @@ class JobSummary(BaseModel):
                 "failed_tasks": 5
             }
         }
+    )
 
 
 class TaskSummary(BaseModel):
@@ -509,11 +521,23 @@ class TaskSummary(BaseModel):
     created_at: datetime = Field(description="创建时间")
     updated_at: datetime = Field(description="最后更新时间")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        schema_extra = {
+    @classmethod
+    def from_row(cls, task) -> "TaskSummary":
+        """由数据库中的 LintingTask（或含同名列的查询行）构造摘要，数据可信，跳过逐字段校验"""
+        # file_name 是模型上的 Python 属性而非列，这里由 source_file_path 推出
+        source_file_path = task.source_file_path
+        return cls.model_construct(
+            task_id=task.task_id,
+            file_name=source_file_path.rsplit('/', 1)[-1] if source_file_path else "",
+            status=task.status,
+            result_file_path=task.result_file_path,
+            error_message=task.error_message,
+            created_at=task.created_at,
+            updated_at=task.updated_at
+        )
+    
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "task_id": "task-e0e1f2e3-4f5f-6a6b-7c7d-8e8f9a9b0c0d",
                 "file_name": "query_users.sql",
@@ -523,6 +547,7 @@ class TaskSummary(BaseModel):
                 "updated_at": "2025-06-27T09:30:15.654321"
             }
         }
+    )
 
 
 class JobDetailResponse(BaseModel):
@@ -545,11 +570,8 @@ class JobDetailResponse(BaseModel):
         description="子任务列表（分页）"
     )
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "job_id": "job-d8b8a7e0-4f7f-4f7b-8f1e-8e6a1e8e6a1e",
                 "job_status": "PROCESSING",
@@ -578,6 +600,7 @@ class JobDetailResponse(BaseModel):
                 }
             }
         }
+    )
 
 
 class JobQueryParams(BaseQueryParams, DateRangeParams):
@@ -585,10 +608,11 @@ class JobQueryParams(BaseQueryParams, DateRangeParams):
     status: Optional[JobStatusEnum] = Field(default=None, description="状态过滤")
     submission_type: Optional[SubmissionTypeEnum] = Field(default=None, description="提交类型过滤")
     
-    @validator('sort_by')
+    @field_validator('sort_by')
+    @classmethod
     def validate_job_sort_by(cls, v):
         """验证排序字段"""
-        if v and v not in ['created_at', 'updated_at', 'user_id', 'product_name', 'status']:
+        if v and v not in _JOB_SORT_FIELDS:
             raise ValueError("不支持的排序字段")
         return v
 
@@ -603,14 +627,16 @@ class JobSearchParams(BaseQueryParams, DateRangeParams):
     submission_type: Optional[SubmissionTypeEnum] = Field(default=None, description="提交类型过滤")
     dialect: Optional[str] = Field(default=None, description="SQLFluff方言")
     
-    @validator('sort_by')
+    @field_validator('sort_by')
+    @classmethod
     def validate_job_search_sort_by(cls, v):
         """验证排序字段"""
-        if v and v not in ['created_at', 'updated_at', 'user_id', 'product_name', 'status', 'submission_type']:
+        if v and v not in _JOB_SEARCH_SORT_FIELDS:
             raise ValueError("不支持的排序字段")
         return v
     
-    @validator('user_id', 'product_name', 'boc_batch_number', 'boc_task_number')
+    @field_validator('user_id', 'product_name', 'boc_batch_number', 'boc_task_number')
+    @classmethod
     def validate_search_fields(cls, v):
         """验证搜索字段"""
         if v is not None:
@@ -620,12 +646,22 @@ class JobSearchParams(BaseQueryParams, DateRangeParams):
         return v
 
 
+class JobPage(PaginationResponse[JobSummary]):
+    """工作分页（具体化的泛型，附带 keyset 分页游标）"""
+    total: Optional[int] = Field(default=None, description="总记录数（按游标翻页时不统计，为 null）")
+    pages: Optional[int] = Field(default=None, description="总页数（按游标翻页时不统计，为 null）")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="下一页游标，传回 cursor 参数即可按 (created_at, id) 定位继续翻页"
+    )
+
+
 class JobListResponse(BaseModel):
     """工作列表响应模型"""
-    jobs: PaginationResponse[JobSummary] = Field(description="工作列表（分页）")
+    jobs: JobPage = Field(description="工作列表（分页）")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "jobs": {
                     "total": 100,
@@ -653,6 +689,7 @@ class JobListResponse(BaseModel):
                 }
             }
         }
+    )
 
 
 class JobStatusUpdateRequest(BaseModel):
@@ -660,11 +697,12 @@ class JobStatusUpdateRequest(BaseModel):
     status: JobStatusEnum = Field(description="新状态")
     error_message: Optional[str] = Field(default=None, description="错误消息")
     
-    @validator('error_message')
-    def validate_error_message(cls, v, values):
+    @field_validator('error_message')
+    @classmethod
+    def validate_error_message(cls, v, info):
         """验证错误消息"""
-        status = values.get('status')
-        if status == JobStatusEnum.FAILED and not v:
+        status = info.data.get('status')
+        if status is JobStatusEnum.FAILED and not v:
             raise ValueError("状态为FAILED时必须提供错误消息")
         return v
 
@@ -680,8 +718,8 @@ class JobStatistics(BaseModel):
     failed_jobs: int = Field(description="失败工作数")
     avg_processing_time: Optional[float] = Field(default=None, description="平均处理时间（分钟）")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "total_jobs": 1005,
                 "accepted_jobs": 10,
@@ -693,6 +731,7 @@ class JobStatistics(BaseModel):
                 "avg_processing_time": 12.5
             }
         }
+    )
 
 
 class JobTaskIdsResponse(BaseModel):
@@ -701,8 +740,8 @@ class JobTaskIdsResponse(BaseModel):
     task_ids: List[str] = Field(description="任务ID列表")
     total_count: int = Field(description="任务总数")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "job_id": "job-d8b8a7e0-4f7f-4f7b-8f1e-8e6a1e8e6a1e",
                 "task_ids": [
@@ -713,3 +752,4 @@ class JobTaskIdsResponse(BaseModel):
                 "total_count": 3
             }
         }
+    )
@@ -4,7 +4,7 @@ SQL检查API数据模型
 定义SQL检查接口的请求和响应模型。
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator, ConfigDict
 from typing import List, Dict, Any, Optional
 from enum import Enum
 
@@ -25,7 +25,8 @@ class SQLCheckRequest(BaseModel):
     )
     dialect: SQLDialectEnum = Field(..., description="SQL方言，必须是 hive 或 gbase8a")
     
-    @validator('sql_content')
+    @field_validator('sql_content')
+    @classmethod
     def validate_sql_content(cls, v):
         """验证SQL内容"""
         if not v or not v.strip():
@@ -33,13 +34,14 @@ class SQLCheckRequest(BaseModel):
         # 不使用strip()，保留原始的换行符以符合SQLFluff的LT12规则
         return v
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "sql_content": "SELECT * FROM users WHERE id = 1;",
                 "dialect": "hive"
             }
         }
+    )
 
 
 class SQLViolation(BaseModel):
@@ -53,8 +55,8 @@ class SQLViolation(BaseModel):
     severity_level: Optional[str] = Field(None, description="严重等级")
     fixable: bool = Field(..., description="是否可修复")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "line_no": 1,
                 "line_pos": 8,
@@ -66,14 +68,15 @@ class SQLViolation(BaseModel):
                 "fixable": True
             }
         }
+    )
 
 
 class SQLCheckResponse(BaseModel):
     """SQL检查响应模型"""
     violations: List[Dict[str, Any]] = Field(..., description="违规项列表（相同行号的项目已合并）")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "violations": [
                     {
@@ -87,3 +90,4 @@ class SQLCheckResponse(BaseModel):
                 ]
             }
         }
+    )
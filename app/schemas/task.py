@@ -5,8 +5,9 @@ Task相关API数据模型
 包括任务详情、结果响应等模型定义。
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
 from typing import Optional, List, Dict, Any
+from typing_extensions import TypedDict
 from datetime import datetime
 
 from app.schemas.common import (
@@ -36,11 +37,30 @@ class TaskResponse(BaseModel):
     severity_critical: Optional[int] = Field(default=None, description="CRITICAL级别违规项数量")
     severity_unknown: Optional[int] = Field(default=None, description="UNKNOWN级别违规项数量")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        schema_extra = {
+    @classmethod
+    def from_row(cls, task) -> "TaskResponse":
+        """由数据库中的 LintingTask 构造响应，数据可信，跳过逐字段校验（仅限 ORM 数据）"""
+        return cls.model_construct(
+            task_id=task.task_id,
+            file_name=task.file_name,
+            status=TaskStatusEnum(task.status),
+            result_file_path=task.result_file_path,
+            error_message=task.error_message,
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            sql_lines=task.sql_lines,
+            total_violations=task.total_violations,
+            critical_violations=task.critical_violations,
+            severity_info=task.severity_info,
+            severity_minor=task.severity_minor,
+            severity_major=task.severity_major,
+            severity_blocker=task.severity_blocker,
+            severity_critical=task.severity_critical,
+            severity_unknown=task.severity_unknown
+        )
+    
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "task_id": "task-e0e1f2e3-4f5f-6a6b-7c7d-8e8f9a9b0c0d",
                 "file_name": "query_users.sql",
@@ -51,6 +71,7 @@ class TaskResponse(BaseModel):
                 "sql_lines": 25
             }
         }
+    )
 
 
 class TaskDetailResponse(BaseModel):
@@ -75,11 +96,38 @@ class TaskDetailResponse(BaseModel):
     severity_critical: Optional[int] = Field(default=None, description="CRITICAL级别违规项数量")
     severity_unknown: Optional[int] = Field(default=None, description="UNKNOWN级别违规项数量")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        schema_extra = {
+    @classmethod
+    def from_row(
+        cls,
+        task,
+        file_size: Optional[int] = None,
+        processing_duration: Optional[float] = None
+    ) -> "TaskDetailResponse":
+        """由数据库中的 LintingTask 构造详情，数据可信，跳过逐字段校验（仅限 ORM 数据）"""
+        return cls.model_construct(
+            task_id=task.task_id,
+            job_id=task.job_id,
+            status=TaskStatusEnum(task.status),
+            source_file_path=task.source_file_path,
+            result_file_path=task.result_file_path,
+            error_message=task.error_message,
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            file_size=file_size,
+            processing_duration=processing_duration,
+            sql_lines=task.sql_lines,
+            total_violations=task.total_violations,
+            critical_violations=task.critical_violations,
+            severity_info=task.severity_info,
+            severity_minor=task.severity_minor,
+            severity_major=task.severity_major,
+            severity_blocker=task.severity_blocker,
+            severity_critical=task.severity_critical,
+            severity_unknown=task.severity_unknown
+        )
+    
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "task_id": "task-e0e1f2e3-4f5f-6a6b-7c7d-8e8f9a9b0c0d",
                 "job_id": "job-d8b8a7e0-4f7f-4f7b-8f1e-8e6a1e8e6a1e",
@@ -93,11 +141,31 @@ class TaskDetailResponse(BaseModel):
                 "sql_lines": 25
             }
         }
+    )
+
+
+class ResultViolation(TypedDict, total=False):
+    """结果文件中的单个违规项（与 SQLFluffService 写出的字段一致）
+
+    字段由 getattr 取自 SQLFluff 违规对象，可能为 None；旧结果文件也可能缺键，
+    因此全部可选，读回时不因个别字段缺失/为空而拒绝整个结果文件。
+    """
+    __pydantic_config__ = ConfigDict(extra='allow')
+
+    line_no: Optional[int]
+    line_pos: Optional[int]
+    code: Optional[str]
+    description: Optional[str]
+    rule: Optional[str]
+    severity: Optional[str]
+    severity_level: Optional[str]
+    fixable: Optional[bool]
+    support: Optional[str]
 
 
 class TaskResultContent(BaseModel):
     """任务结果内容模型（SQLFluff分析结果）"""
-    violations: List[Dict[str, Any]] = Field(description="SQLFluff违规项列表")
+    violations: List[ResultViolation] = Field(description="SQLFluff违规项列表")
     summary: Dict[str, Any] = Field(description="分析摘要")
     file_info: Dict[str, Any] = Field(description="文件信息")
     analysis_metadata: Dict[str, Any] = Field(description="分析元数据")
@@ -106,8 +174,8 @@ class TaskResultContent(BaseModel):
         description="解析树摘要（可选；默认任务结果不再包含完整树文本）",
     )
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "violations": [
                     {
@@ -145,6 +213,7 @@ class TaskResultContent(BaseModel):
                 }
             }
         }
+    )
 
 
 class TaskViolationWithSQL(BaseModel):
@@ -162,8 +231,8 @@ class TaskViolationWithSQL(BaseModel):
     sql_line: str = Field(description="对应的SQL行内容")
     support: Optional[str] = Field(default="", description="规则支持信息（来自修改后的SQLFluff）")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "violation_id": 12345,
                 "is_appealed": False,
@@ -178,14 +247,15 @@ class TaskViolationWithSQL(BaseModel):
                 "support": ""
             }
         }
+    )
 
 
 class TaskLintResultResponse(BaseModel):
     """任务Lint结果响应模型（只包含violations和SQL行内容）"""
     violations: List[TaskViolationWithSQL] = Field(description="带SQL行内容的违规项列表")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "violations": [
                     {
@@ -202,6 +272,7 @@ class TaskLintResultResponse(BaseModel):
                 ]
             }
         }
+    )
 
 
 class TaskStatusUpdateRequest(BaseModel):
@@ -211,21 +282,18 @@ class TaskStatusUpdateRequest(BaseModel):
     error_message: Optional[str] = Field(default=None, description="错误消息")
     processing_duration: Optional[float] = Field(default=None, description="处理时长（秒）")
     
-    @validator('result_file_path')
-    def validate_result_file_path(cls, v, values):
-        """验证结果文件路径"""
-        status = values.get('status')
-        if status == TaskStatusEnum.SUCCESS and not v:
+    @model_validator(mode='after')
+    def validate_status_fields(self):
+        """按状态一次性校验结果文件路径与错误消息"""
+        if self.status is TaskStatusEnum.SUCCESS and not self.result_file_path:
             raise ValueError("状态为SUCCESS时必须提供结果文件路径")
-        return v
-    
-    @validator('error_message')
-    def validate_error_message(cls, v, values):
-        """验证错误消息"""
-        status = values.get('status')
-        if status == TaskStatusEnum.FAILURE and not v:
+        if self.status is TaskStatusEnum.FAILURE and not self.error_message:
             raise ValueError("状态为FAILURE时必须提供错误消息")
-        return v
+        return self
+
+
+_TASK_SORT_FIELDS = frozenset({'created_at', 'updated_at', 'status', 'source_file_path'})
+_TASK_SORT_FIELDS_STR = "created_at, updated_at, status, source_file_path"
 
 
 class TaskQueryParams(BaseQueryParams, DateRangeParams):
@@ -233,21 +301,25 @@ class TaskQueryParams(BaseQueryParams, DateRangeParams):
     status: Optional[TaskStatusEnum] = Field(default=None, description="状态过滤")
     job_id: Optional[str] = Field(default=None, description="工作ID过滤")
     
-    @validator('sort_by')
+    @field_validator('sort_by')
+    @classmethod
     def validate_task_sort_by(cls, v):
         """验证Task排序字段"""
-        allowed_fields = ['created_at', 'updated_at', 'status', 'source_file_path']
-        if v and v not in allowed_fields:
-            raise ValueError(f'排序字段必须是以下之一: {", ".join(allowed_fields)}')
+        if v and v not in _TASK_SORT_FIELDS:
+            raise ValueError(f'排序字段必须是以下之一: {_TASK_SORT_FIELDS_STR}')
         return v
 
 
+class TaskPage(PaginationResponse[TaskResponse]):
+    """任务分页（具体化的泛型，模块加载时一次性生成schema）"""
+
+
 class TaskListResponse(BaseModel):
     """任务列表响应模型"""
-    tasks: PaginationResponse[TaskResponse] = Field(description="任务列表（分页）")
+    tasks: TaskPage = Field(description="任务列表（分页）")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "tasks": {
                     "total": 50,
@@ -269,6 +341,7 @@ class TaskListResponse(BaseModel):
                 }
             }
         }
+    )
 
 
 class TaskStatistics(BaseModel):
@@ -281,8 +354,8 @@ class TaskStatistics(BaseModel):
     avg_processing_time: Optional[float] = Field(default=None, description="平均处理时间（秒）")
     success_rate: float = Field(description="成功率（百分比）")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "total_tasks": 5000,
                 "pending_tasks": 50,
@@ -293,20 +366,16 @@ class TaskStatistics(BaseModel):
                 "success_rate": 91.3
             }
         }
+    )
 
 
 class TaskRetryRequest(BaseModel):
     """任务重试请求模型"""
-    task_ids: List[str] = Field(description="要重试的任务ID列表")
-    
-    @validator('task_ids')
-    def validate_task_ids(cls, v):
-        """验证任务ID列表"""
-        if not v:
-            raise ValueError("任务ID列表不能为空")
-        if len(v) > 100:
-            raise ValueError("一次最多重试100个任务")
-        return v
+    task_ids: List[str] = Field(
+        min_length=1,
+        max_length=100,
+        description="要重试的任务ID列表（一次1-100个）"
+    )
 
 
 class TaskRetryResponse(BaseModel):
@@ -314,8 +383,8 @@ class TaskRetryResponse(BaseModel):
     submitted_tasks: List[str] = Field(description="已提交重试的任务ID列表")
     failed_submissions: List[Dict[str, str]] = Field(description="提交失败的任务信息")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "submitted_tasks": [
                     "task-e0e1f2e3-4f5f-6a6b-7c7d-8e8f9a9b0c0d",
@@ -329,6 +398,7 @@ class TaskRetryResponse(BaseModel):
                 ]
             }
         }
+    )
 
 
 class TaskFileInfo(BaseModel):
@@ -339,11 +409,8 @@ class TaskFileInfo(BaseModel):
     encoding: Optional[str] = Field(default=None, description="文件编码")
     last_modified: Optional[datetime] = Field(default=None, description="最后修改时间")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "file_name": "query_users.sql",
                 "file_size": 2048,
@@ -352,6 +419,7 @@ class TaskFileInfo(BaseModel):
                 "last_modified": "2025-06-27T09:25:00.123456"
             }
         }
+    )
 
 
 class TaskProgressResponse(BaseModel):
@@ -362,11 +430,8 @@ class TaskProgressResponse(BaseModel):
     current_step: str = Field(description="当前处理步骤")
     estimated_completion: Optional[datetime] = Field(default=None, description="预计完成时间")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "task_id": "task-e0e1f2e3-4f5f-6a6b-7c7d-8e8f9a9b0c0d",
                 "status": "IN_PROGRESS",
@@ -375,6 +440,7 @@ class TaskProgressResponse(BaseModel):
                 "estimated_completion": "2025-06-27T09:32:00.123456"
             }
         }
+    )
 
 
 class SeverityLevelStatistics(BaseModel):
@@ -387,8 +453,8 @@ class SeverityLevelStatistics(BaseModel):
     UNKNOWN: int = Field(default=0, description="未知级别违规项数量")
     appealed: int = Field(default=0, description="已申诉的违规项数量（所有级别）")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "INFO": 15,
                 "MINOR": 8,
@@ -399,6 +465,7 @@ class SeverityLevelStatistics(BaseModel):
                 "appealed": 5
             }
         }
+    )
 
 
 class TaskSeverityCalculateResponse(BaseModel):
@@ -409,8 +476,8 @@ class TaskSeverityCalculateResponse(BaseModel):
     skipped_count: int = Field(description="跳过的任务数")
     failed_tasks: List[Dict[str, str]] = Field(description="失败的任务列表")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "total_processed": 150,
                 "success_count": 140,
@@ -424,6 +491,7 @@ class TaskSeverityCalculateResponse(BaseModel):
                 ]
             }
         }
+    )
 
 
 class TaskWithViolationsResponse(BaseModel):
@@ -446,11 +514,8 @@ class TaskWithViolationsResponse(BaseModel):
         description="符合筛选条件的violations数量"
     )
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "task_id": "task-e0e1f2e3-4f5f-6a6b-7c7d-8e8f9a9b0c0d",
                 "file_name": "query_users.sql",
@@ -480,14 +545,15 @@ class TaskWithViolationsResponse(BaseModel):
                 "matched_count": 1
             }
         }
+    )
 
 
 class TaskWithViolationsListResponse(BaseModel):
     """任务列表响应（带violations，用于V2接口）"""
     tasks: PaginationResponse[TaskWithViolationsResponse] = Field(description="任务列表（分页）")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "tasks": {
                     "total": 50,
@@ -507,4 +573,5 @@ class TaskWithViolationsListResponse(BaseModel):
                     ]
                 }
             }
-        } 
\ No newline at end of file
+        }
+    )
\ No newline at end of file
@@ -5,7 +5,7 @@ Violation相关API数据模型
 包括违规项详情、统计响应等模型定义。
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -26,11 +26,8 @@ class ViolationResponse(BaseModel):
     fixable: bool = Field(default=False, description="是否可自动修复")
     created_at: datetime = Field(description="创建时间")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "id": 12345,
                 "task_id": "task-e0e1f2e3-4f5f-6a6b-7c7d-8e8f9a9b0c0d",
@@ -47,6 +44,7 @@ class ViolationResponse(BaseModel):
                 "created_at": "2025-10-21T10:30:15.654321"
             }
         }
+    )
 
 
 class ViolationSimple(BaseModel):
@@ -60,8 +58,8 @@ class ViolationSimple(BaseModel):
     sql_line: Optional[str] = Field(default=None, description="问题所在的SQL代码行")
     fixable: bool = Field(default=False, description="是否可自动修复")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "rule_code": "RF02",
                 "rule_name": "references.qualification",
@@ -73,6 +71,7 @@ class ViolationSimple(BaseModel):
                 "fixable": False
             }
         }
+    )
 
 
 class TaskWithViolations(BaseModel):
@@ -84,8 +83,8 @@ class TaskWithViolations(BaseModel):
     total_violations: Optional[int] = Field(default=None, description="违规项总数")
     violations: List[ViolationSimple] = Field(description="违规项列表")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "task_id": "task-e0e1f2e3-4f5f-6a6b-7c7d-8e8f9a9b0c0d",
                 "source_file_path": "jobs/job-xxx/file1.sql",
@@ -102,6 +101,7 @@ class TaskWithViolations(BaseModel):
                 ]
             }
         }
+    )
 
 
 class JobViolationsResponse(BaseModel):
@@ -111,8 +111,8 @@ class JobViolationsResponse(BaseModel):
     total_violations: int = Field(description="违规项总数")
     tasks: List[TaskWithViolations] = Field(description="任务列表（包含违规项）")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "job_id": "job-d8b8a7e0-4f7f-4f7b-8f1e-8e6a1e8e6a1e",
                 "total_tasks": 10,
@@ -129,6 +129,7 @@ class JobViolationsResponse(BaseModel):
                 ]
             }
         }
+    )
 
 
 class RuleStatistics(BaseModel):
@@ -139,8 +140,8 @@ class RuleStatistics(BaseModel):
     count: int = Field(description="触发次数")
     affected_files: int = Field(description="影响的文件数")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "rule_code": "RF02",
                 "rule_name": "references.qualification",
@@ -149,6 +150,7 @@ class RuleStatistics(BaseModel):
                 "affected_files": 25
             }
         }
+    )
 
 
 class SeverityStatistics(BaseModel):
@@ -157,14 +159,15 @@ class SeverityStatistics(BaseModel):
     count: int = Field(description="违规项数量")
     percentage: float = Field(description="占比（百分比）")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "severity_level": "MAJOR",
                 "count": 150,
                 "percentage": 35.5
             }
         }
+    )
 
 
 class JobStatisticsResponse(BaseModel):
@@ -180,8 +183,8 @@ class JobStatisticsResponse(BaseModel):
     # 规则热度 TOP 20
     top_rules: List[RuleStatistics] = Field(description="规则触发次数 TOP 20")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "job_id": "job-d8b8a7e0-4f7f-4f7b-8f1e-8e6a1e8e6a1e",
                 "total_violations": 450,
@@ -205,6 +208,7 @@ class JobStatisticsResponse(BaseModel):
                 ]
             }
         }
+    )
 
 
 class ViolationQueryParams(BaseModel):
@@ -213,12 +217,13 @@ class ViolationQueryParams(BaseModel):
     rule_code: Optional[str] = Field(default=None, description="过滤规则编号")
     file_name_pattern: Optional[str] = Field(default=None, description="文件名模式")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "severity_level": "BLOCKER,CRITICAL",
                 "rule_code": "RF02,L032",
                 "file_name_pattern": "*.sql"
             }
         }
+    )
 
@@ -5,20 +5,22 @@ Job业务服务
 为FastAPI Web服务和Celery Worker提供统一的Job业务接口。
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, and_, or_, exists
 from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import os
+import time
+import base64
 import asyncio
 
-from app.models.database import LintingJob, LintingTask
+from app.models.database import LintingJob, LintingTask, JobQueryHelper
 from app.schemas.job import (
     JobCreateRequest, JobCreateResponse, JobDetailResponse, 
-    JobSummary, JobStatistics, TaskSummary
+    JobSummary, JobPage, JobStatistics, TaskSummary
 )
 from app.schemas.common import PaginationResponse, JobStatusEnum, SubmissionTypeEnum
-from app.core.exceptions import JobException, FileException, ErrorCode
+from app.core.exceptions import JobException, FileException, ValidationException, ErrorCode
 from app.core.logging import service_logger
 from app.utils.uuid_utils import generate_job_id, generate_task_id
 from app.utils.file_utils import FileManager
@@ -26,6 +28,65 @@ from app.config.settings import get_settings
 
 settings = get_settings()
 
+# Job 统计结果的进程内缓存：(start_date, end_date) -> (过期时间(monotonic), 统计结果)
+_JOB_STATISTICS_CACHE: Dict[Tuple[Optional[datetime], Optional[datetime]], Tuple[float, JobStatistics]] = {}
+_JOB_STATISTICS_CACHE_MAX_ENTRIES = 128
+
+
+def clear_job_statistics_cache() -> None:
+    """清空 Job 统计结果缓存"""
+    _JOB_STATISTICS_CACHE.clear()
+
+
+def _encode_job_cursor(job: LintingJob) -> str:
+    """由一页最后一个Job生成 keyset 游标（其主键的 URL 安全编码）"""
+    return base64.urlsafe_b64encode(str(job.id).encode()).decode()
+
+
+def _decode_job_cursor(cursor: str) -> int:
+    """解析 keyset 游标得到Job主键，格式不合法时抛出参数验证异常"""
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        raise ValidationException("无效的分页游标", field="cursor", value=cursor)
+
+
+# Job 状态机的合法转换 (当前状态, 目标状态)。以字符串保存：数据库读出的 status 为 str，
+# 与 str 枚举成员等值同哈希，两者均可直接查找
+_JOB_STATUS_TRANSITIONS = frozenset(
+    (current.value, target.value)
+    for current, targets in {
+        JobStatusEnum.ACCEPTED: (
+            JobStatusEnum.EXPANDING,
+            JobStatusEnum.PROCESSING,
+            JobStatusEnum.COMPLETED,
+            JobStatusEnum.FAILED,
+        ),
+        JobStatusEnum.EXPANDING: (
+            JobStatusEnum.PROCESSING,
+            JobStatusEnum.FAILED,
+            JobStatusEnum.ACCEPTED,
+        ),
+        JobStatusEnum.PROCESSING: (
+            JobStatusEnum.COMPLETED,
+            JobStatusEnum.PARTIALLY_COMPLETED,
+            JobStatusEnum.FAILED,
+        ),
+        JobStatusEnum.COMPLETED: (),
+        JobStatusEnum.PARTIALLY_COMPLETED: (),
+        JobStatusEnum.FAILED: (JobStatusEnum.PROCESSING, JobStatusEnum.ACCEPTED),
+    }.items()
+    for target in targets
+)
+
+# 目标状态 -> 允许的来源状态，供 update_job_status 的条件 UPDATE 使用
+_ALLOWED_FROM_STATUSES = {
+    target.value: tuple(sorted(
+        current for current, to in _JOB_STATUS_TRANSITIONS if to == target.value
+    ))
+    for target in JobStatusEnum
+}
+
 
 class JobService:
     """Job业务服务类"""
@@ -56,8 +117,14 @@ class JobService:
             else:
                 submission_type = SubmissionTypeEnum.ZIP_ARCHIVE
                 source_path = request.zip_file_path
-                # 验证ZIP文件存在
-                if not self.file_manager.file_exists(source_path):
+                # 验证ZIP文件存在（NFS stat 放到线程池，避免阻塞事件循环）
+                loop = asyncio.get_event_loop()
+                zip_exists = await loop.run_in_executor(
+                    None,
+                    self.file_manager.file_exists,
+                    source_path
+                )
+                if not zip_exists:
                     raise JobException(ErrorCode.FILE_NOT_FOUND, job_id, "ZIP文件不存在")
             
             # 创建数据库记录
@@ -172,6 +239,12 @@ class JobService:
             self.logger.error(f"获取Job失败: {job_id}, 错误: {e}")
             raise JobException(ErrorCode.JOB_NOT_FOUND, job_id, str(e))
     
+    async def _job_exists(self, job_id: str) -> bool:
+        """判断Job是否存在（SELECT EXISTS，走 job_id 唯一索引）"""
+        return bool(
+            self.db.query(exists().where(LintingJob.job_id == job_id)).scalar()
+        )
+    
     async def get_job_with_tasks(self, job_id: str, page: int = 1, size: int = 10) -> Optional[JobDetailResponse]:
         """
         获取Job及其关联的Tasks分页列表
@@ -190,30 +263,39 @@ class JobService:
             if not job:
                 return None
             
-            # 获取Task分页数据
-            total_tasks = job.tasks.count()
-            tasks_query = job.tasks.order_by(LintingTask.created_at.asc())
-            tasks = tasks_query.offset((page - 1) * size).limit(size).all()
+            # 获取Task分页数据（走 idx_task_job_created，只取摘要所需列）
+            tasks_query = self.db.query(LintingTask).filter(
+                LintingTask.job_id == job_id
+            )
+            total_tasks = tasks_query.with_entities(func.count(LintingTask.id)).scalar()
+            tasks = (
+                tasks_query.with_entities(
+                    LintingTask.task_id,
+                    LintingTask.source_file_path,
+                    LintingTask.status,
+                    LintingTask.result_file_path,
+                    LintingTask.error_message,
+                    LintingTask.created_at,
+                    LintingTask.updated_at
+                )
+                .order_by(LintingTask.created_at.asc())
+                .offset((page - 1) * size)
+                .limit(size)
+                .all()
+            )
             
             # 构造Task摘要列表
-            task_summaries = [TaskSummary(
-                task_id=task.task_id,
-                file_name=task.file_name,
-                status=task.status,
-                result_file_path=task.result_file_path,
-                error_message=task.error_message,
-                created_at=task.created_at,
-                updated_at=task.updated_at
-            ) for task in tasks]
+            task_summaries = [TaskSummary.from_row(task) for task in tasks]
             
             # 构造分页响应
-            pagination_response = PaginationResponse[TaskSummary](
+            pages = (total_tasks + size - 1) // size
+            pagination_response = PaginationResponse[TaskSummary].model_construct(
                 items=task_summaries,
                 total=total_tasks,
                 page=page,
                 size=size,
-                pages=(total_tasks + size - 1) // size,
-                has_next=page < ((total_tasks + size - 1) // size),
+                pages=pages,
+                has_next=page < pages,
                 has_prev=page > 1
             )
             
@@ -253,13 +335,16 @@ class JobService:
             Optional[Dict[str, Any]]: 包含task_ids列表和总数的字典
         """
         try:
-            # 获取Job
-            job = await self.get_job_by_id(job_id)
-            if not job:
+            # 只需确认Job存在，不加载整行
+            if not await self._job_exists(job_id):
                 return None
             
             # 获取所有任务的ID
-            task_ids = [task.task_id for task in job.tasks.all()]
+            task_ids = [
+                task_id for (task_id,) in self.db.query(LintingTask.task_id)
+                .filter(LintingTask.job_id == job_id)
+                .all()
+            ]
             
             result = {
                 "job_id": job_id,
@@ -284,17 +369,26 @@ class JobService:
             error_message: 错误消息
         """
         try:
-            job = await self.get_job_by_id(job_id)
-            if not job:
-                raise JobException(ErrorCode.JOB_NOT_FOUND, job_id, "Job不存在")
-            
-            # 验证状态转换
-            if not self._is_valid_status_transition(job.status, status):
-                raise JobException(ErrorCode.JOB_INVALID_STATUS, job_id, f"无效的状态转换: {job.status} -> {status}")
-            
-            job.status = status
+            # 条件 UPDATE：状态转换校验与写入在同一条语句内完成，避免先查后改的竞态
+            allowed_from = _ALLOWED_FROM_STATUSES[status]
+            values = {LintingJob.status: status}
             if error_message:
-                job.error_message = error_message
+                values[LintingJob.error_message] = error_message
+            
+            updated = (
+                self.db.query(LintingJob)
+                .filter(LintingJob.job_id == job_id, LintingJob.status.in_(allowed_from))
+                .update(values, synchronize_session='evaluate')
+            )
+            if not updated:
+                current_status = (
+                    self.db.query(LintingJob.status)
+                    .filter(LintingJob.job_id == job_id)
+                    .scalar()
+                )
+                if current_status is None:
+                    raise JobException(ErrorCode.JOB_NOT_FOUND, job_id, "Job不存在")
+                raise JobException(ErrorCode.JOB_INVALID_STATUS, job_id, f"无效的状态转换: {current_status} -> {status}")
             
             self.db.commit()
             self.logger.info(f"Job状态更新: {job_id}, {status}")
@@ -317,7 +411,8 @@ class JobService:
             JobStatusEnum: 计算后的状态
         """
         from app.services.job_status import (
-            compute_aggregate_job_status,
+            compute_job_status_from_counts,
+            count_valid_task_statuses,
             update_job_status_from_tasks,
         )
 
@@ -326,11 +421,12 @@ class JobService:
             if not job:
                 raise JobException(ErrorCode.JOB_NOT_FOUND, job_id, "Job不存在")
 
-            tasks = job.tasks.all()
-            if not tasks:
+            # 一次 GROUP BY 取各状态计数，无需加载全部 Task
+            total, valid_counts = count_valid_task_statuses(self.db, job_id)
+            if not total:
                 return job.status
 
-            new_status = compute_aggregate_job_status(tasks)
+            new_status = compute_job_status_from_counts(valid_counts)
             if new_status and job.status != new_status:
                 if self._is_valid_status_transition(job.status, new_status):
                     await self.update_job_status(job_id, new_status)
@@ -358,28 +454,40 @@ class JobService:
         Returns:
             JobStatistics: 统计信息
         """
+        # 仪表盘会以相同时间窗口反复刷新，短 TTL 内直接复用上次结果
+        ttl_seconds = settings.JOB_STATISTICS_CACHE_TTL_SECONDS
+        cache_key = (start_date, end_date)
+        if ttl_seconds > 0:
+            cached = _JOB_STATISTICS_CACHE.get(cache_key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+        
         try:
-            query = self.db.query(LintingJob)
-            
             # 日期范围过滤
+            filters = []
             if start_date:
-                query = query.filter(LintingJob.created_at >= start_date)
+                filters.append(LintingJob.created_at >= start_date)
             if end_date:
-                query = query.filter(LintingJob.created_at <= end_date)
-            
-            # 统计各状态的Job数量
-            total_jobs = query.count()
-            accepted_jobs = query.filter(LintingJob.status == JobStatusEnum.ACCEPTED).count()
-            expanding_jobs = query.filter(LintingJob.status == JobStatusEnum.EXPANDING).count()
-            processing_jobs = query.filter(LintingJob.status == JobStatusEnum.PROCESSING).count()
-            completed_jobs = query.filter(LintingJob.status == JobStatusEnum.COMPLETED).count()
-            partially_completed_jobs = query.filter(LintingJob.status == JobStatusEnum.PARTIALLY_COMPLETED).count()
-            failed_jobs = query.filter(LintingJob.status == JobStatusEnum.FAILED).count()
-            
-            # 计算平均处理时间
+                filters.append(LintingJob.created_at <= end_date)
+            
+            # 一次分组查询统计各状态的Job数量
+            status_counts = dict(
+                self.db.query(LintingJob.status, func.count(LintingJob.id))
+                .filter(*filters)
+                .group_by(LintingJob.status)
+                .all()
+            )
+            total_jobs = sum(status_counts.values())
+            accepted_jobs = status_counts.get(JobStatusEnum.ACCEPTED.value, 0)
+            expanding_jobs = status_counts.get(JobStatusEnum.EXPANDING.value, 0)
+            processing_jobs = status_counts.get(JobStatusEnum.PROCESSING.value, 0)
+            completed_jobs = status_counts.get(JobStatusEnum.COMPLETED.value, 0)
+            partially_completed_jobs = status_counts.get(JobStatusEnum.PARTIALLY_COMPLETED.value, 0)
+            failed_jobs = status_counts.get(JobStatusEnum.FAILED.value, 0)
+            
+            # 计算平均处理时间（TIMESTAMPDIFF 仅 MySQL 支持，无已完成Job时不发起查询）
             avg_processing_time = None
             if completed_jobs > 0:
-                completed_query = query.filter(LintingJob.status == JobStatusEnum.COMPLETED)
                 avg_time_result = self.db.query(
                     func.avg(
                         func.timestampdiff(
@@ -388,12 +496,12 @@ class JobService:
                             LintingJob.updated_at
                         )
                     )
-                ).filter(LintingJob.status == JobStatusEnum.COMPLETED).scalar()
+                ).filter(LintingJob.status == JobStatusEnum.COMPLETED, *filters).scalar()
                 
                 if avg_time_result:
                     avg_processing_time = float(avg_time_result) / 60  # 转换为分钟
             
-            return JobStatistics(
+            statistics = JobStatistics(
                 total_jobs=total_jobs,
                 accepted_jobs=accepted_jobs,
                 expanding_jobs=expanding_jobs,
@@ -404,6 +512,12 @@ class JobService:
                 avg_processing_time=avg_processing_time
             )
             
+            if ttl_seconds > 0:
+                if len(_JOB_STATISTICS_CACHE) >= _JOB_STATISTICS_CACHE_MAX_ENTRIES:
+                    _JOB_STATISTICS_CACHE.clear()
+                _JOB_STATISTICS_CACHE[cache_key] = (time.monotonic() + ttl_seconds, statistics)
+            return statistics
+            
         except Exception as e:
             self.logger.error(f"获取Job统计失败: {e}")
             raise JobException(ErrorCode.DATABASE_QUERY_ERROR, "all", str(e))
@@ -412,10 +526,15 @@ class JobService:
                        status: Optional[JobStatusEnum] = None,
                        submission_type: Optional[SubmissionTypeEnum] = None,
                        start_date: Optional[datetime] = None,
-                       end_date: Optional[datetime] = None) -> PaginationResponse[JobSummary]:
+                       end_date: Optional[datetime] = None,
+                       cursor: Optional[str] = None) -> JobPage:
         """
         获取Job列表（分页）
         
+        传入 cursor 时按 (created_at, id) 从游标所在行向后定位（keyset 分页），
+        不再依赖 OFFSET，也不统计总数（total/pages 为 None），page 仅原样回显；
+        否则按 page 做 OFFSET 分页。游标指向的Job不存在时抛出参数验证异常。
+        
         Args:
             page: 页码
             size: 每页大小
@@ -423,11 +542,18 @@ class JobService:
             submission_type: 提交类型过滤
             start_date: 开始日期
             end_date: 结束日期
+            cursor: 上一页返回的 next_cursor
             
         Returns:
-            PaginationResponse[JobSummary]: 分页的Job摘要列表
+            JobPage: 分页的Job摘要列表
         """
+        cursor_id = _decode_job_cursor(cursor) if cursor else None
         try:
+            if cursor_id is not None and not self.db.query(
+                exists().where(LintingJob.id == cursor_id)
+            ).scalar():
+                raise ValidationException("分页游标对应的Job不存在", field="cursor", value=cursor)
+            
             query = self.db.query(LintingJob)
             
             # 应用过滤条件
@@ -440,47 +566,66 @@ class JobService:
             if end_date:
                 query = query.filter(LintingJob.created_at <= end_date)
             
-            # 排序
-            query = query.order_by(LintingJob.created_at.desc())
-            
-            # 分页
-            total = query.count()
-            jobs = query.offset((page - 1) * size).limit(size).all()
+            # 排序（id 作为同一时间戳下的稳定次序）
+            ordering = (LintingJob.created_at.desc(), LintingJob.id.desc())
+            
+            # 分页：先在 idx_job_created 上取当前页的主键，再回表取整行（延迟关联）；
+            # 有游标时直接在索引上定位，深分页不再扫描并丢弃 OFFSET 行。
+            # 多取一行用于判断是否还有下一页；游标翻页不做全量 COUNT
+            total = query.count() if cursor_id is None else None
+            ids_query = query.with_entities(LintingJob.id).order_by(*ordering)
+            if cursor_id is not None:
+                # 游标行的 created_at 由主键标量子查询取得，不经过客户端往返，
+                # 避免时间精度/格式差异导致同一时间戳下的行重复或遗漏；
+                # 子查询用别名，防止与外层 linting_jobs 自动关联
+                cursor_job = aliased(LintingJob)
+                cursor_created_at = (
+                    self.db.query(cursor_job.created_at)
+                    .filter(cursor_job.id == cursor_id)
+                    .scalar_subquery()
+                )
+                ids_query = ids_query.filter(or_(
+                    LintingJob.created_at < cursor_created_at,
+                    and_(LintingJob.created_at == cursor_created_at, LintingJob.id < cursor_id)
+                ))
+            else:
+                ids_query = ids_query.offset((page - 1) * size)
+            page_ids = ids_query.limit(size + 1).subquery()
+            jobs = (
+                self.db.query(LintingJob)
+                .join(page_ids, LintingJob.id == page_ids.c.id)
+                .order_by(*ordering)
+                .all()
+            )
+            has_next = len(jobs) > size
+            jobs = jobs[:size]
+            next_cursor = _encode_job_cursor(jobs[-1]) if has_next else None
             
             # 构造摘要列表
-            job_summaries = []
-            for job in jobs:
-                job_summaries.append(JobSummary(
-                    job_id=job.job_id,
-                    status=job.status,
-                    submission_type=job.submission_type,
-                    source_path=job.source_path,
-                    dialect=job.dialect,
-                    user_id=job.user_id,
-                    product_name=job.product_name,
-                    boc_batch_number=job.boc_batch_number,
-                    boc_task_number=job.boc_task_number,
-                    rules=job.rules,
-                    created_at=job.created_at,
-                    updated_at=job.updated_at,
-                    task_count=job.get_task_count(),
-                    successful_tasks=job.get_successful_task_count(),
-                    failed_tasks=job.get_failed_task_count(),
-                    error_message=job.error_message
-                ))
+            # 整页Job的任务计数合并为一次分组查询
+            status_counts = JobQueryHelper.get_task_status_counts_by_jobs(
+                self.db, [job.job_id for job in jobs]
+            )
+            job_summaries = [
+                JobSummary.from_row(job, status_counts[job.job_id])
+                for job in jobs
+            ]
             
             # 构造分页响应
-            pages = (total + size - 1) // size
-            return PaginationResponse[JobSummary](
+            pages = (total + size - 1) // size if total is not None else None
+            return JobPage.model_construct(
                 items=job_summaries,
                 total=total,
                 page=page,
                 size=size,
                 pages=pages,
-                has_next=page < pages,
-                has_prev=page > 1
+                has_next=has_next,
+                has_prev=cursor_id is not None or page > 1,
+                next_cursor=next_cursor
             )
             
+        except ValidationException:
+            raise
         except Exception as e:
             self.logger.error(f"获取Job列表失败: {e}")
             raise JobException(ErrorCode.DATABASE_QUERY_ERROR, "all", str(e))
@@ -496,7 +641,7 @@ class JobService:
                          start_date: Optional[datetime] = None,
                          end_date: Optional[datetime] = None,
                          sort_by: str = "created_at",
-                         sort_order: str = "desc") -> PaginationResponse[JobSummary]:
+                         sort_order: str = "desc") -> JobPage:
         """
         高级搜索Job列表（分页）
         
@@ -516,7 +661,7 @@ class JobService:
             sort_order: 排序方向（asc/desc）
             
         Returns:
-            PaginationResponse[JobSummary]: 分页的Job摘要列表
+            JobPage: 分页的Job摘要列表
         """
         try:
             query = self.db.query(LintingJob)
@@ -557,30 +702,18 @@ class JobService:
             jobs = query.offset((page - 1) * size).limit(size).all()
             
             # 构造摘要列表
-            job_summaries = []
-            for job in jobs:
-                job_summaries.append(JobSummary(
-                    job_id=job.job_id,
-                    status=job.status,
-                    submission_type=job.submission_type,
-                    source_path=job.source_path,
-                    dialect=job.dialect,
-                    user_id=job.user_id,
-                    product_name=job.product_name,
-                    boc_batch_number=job.boc_batch_number,
-                    boc_task_number=job.boc_task_number,
-                    rules=job.rules,
-                    created_at=job.created_at,
-                    updated_at=job.updated_at,
-                    task_count=job.get_task_count(),
-                    successful_tasks=job.get_successful_task_count(),
-                    failed_tasks=job.get_failed_task_count(),
-                    error_message=job.error_message
-                ))
+            # 整页Job的任务计数合并为一次分组查询
+            status_counts = JobQueryHelper.get_task_status_counts_by_jobs(
+                self.db, [job.job_id for job in jobs]
+            )
+            job_summaries = [
+                JobSummary.from_row(job, status_counts[job.job_id])
+                for job in jobs
+            ]
             
             # 构造分页响应
             pages = (total + size - 1) // size
-            return PaginationResponse[JobSummary](
+            return JobPage.model_construct(
                 items=job_summaries,
                 total=total,
                 page=page,
@@ -603,8 +736,14 @@ class JobService:
             file_name = f"single_sql_{job_id}.sql"
             relative_path = f"jobs/{job_id}/sources/{file_name}"
             
-            # 保存文件
-            self.file_manager.write_text_file(relative_path, sql_content)
+            # 在线程池中写文件，避免NFS写入阻塞事件循环
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(
+                None,
+                self.file_manager.write_text_file,
+                relative_path,
+                sql_content
+            )
             
             self.logger.debug(f"保存单SQL文件: {relative_path}")
             return relative_path
@@ -622,9 +761,15 @@ class JobService:
     async def _create_zip_archive_tasks(self, job_id: str, zip_path: str):
         """为ZIP文件创建多个Task"""
         try:
-            # 解压ZIP文件
+            # 在线程池中解压ZIP文件，避免阻塞事件循环
             extract_to = f"jobs/{job_id}/extracted"
-            _, sql_files = self.file_manager.extract_zip_file(zip_path, extract_to)
+            loop = asyncio.get_event_loop()
+            _, sql_files = await loop.run_in_executor(
+                None,
+                self.file_manager.extract_zip_file,
+                zip_path,
+                extract_to
+            )
             
             if not sql_files:
                 # 没有SQL文件时，直接将Job状态设置为COMPLETED，而不是抛出异常
@@ -683,28 +828,7 @@ class JobService:
                 raise
             raise JobException("创建解压文件夹任务", job_id, str(e))
     
-    def _is_valid_status_transition(self, current_status: JobStatusEnum, new_status: JobStatusEnum) -> bool:
+    @staticmethod
+    def _is_valid_status_transition(current_status: JobStatusEnum, new_status: JobStatusEnum) -> bool:
         """验证状态转换是否有效"""
-        valid_transitions = {
-            JobStatusEnum.ACCEPTED: [
-                JobStatusEnum.EXPANDING,
-                JobStatusEnum.PROCESSING,
-                JobStatusEnum.COMPLETED,
-                JobStatusEnum.FAILED,
-            ],
-            JobStatusEnum.EXPANDING: [
-                JobStatusEnum.PROCESSING,
-                JobStatusEnum.FAILED,
-                JobStatusEnum.ACCEPTED,
-            ],
-            JobStatusEnum.PROCESSING: [
-                JobStatusEnum.COMPLETED,
-                JobStatusEnum.PARTIALLY_COMPLETED,
-                JobStatusEnum.FAILED,
-            ],
-            JobStatusEnum.COMPLETED: [],
-            JobStatusEnum.PARTIALLY_COMPLETED: [],
-            JobStatusEnum.FAILED: [JobStatusEnum.PROCESSING, JobStatusEnum.ACCEPTED],
-        }
-
-        return new_status in valid_transitions.get(current_status, [])
+        return (current_status, new_status) in _JOB_STATUS_TRANSITIONS
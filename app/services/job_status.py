@@ -5,8 +5,9 @@ Job 状态聚合
 """
 
 import logging
-from typing import Iterable, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
+from sqlalchemy import and_, case, func
 from sqlalchemy.orm import Session
 
 from app.models.database import LintingJob, LintingTask
@@ -14,20 +15,22 @@ from app.schemas.common import JobStatusEnum, TaskStatusEnum
 
 logger = logging.getLogger(__name__)
 
-TERMINAL_TASK_STATUSES = frozenset(
-    {TaskStatusEnum.SUCCESS, TaskStatusEnum.FAILURE}
-)
+# 以纯字符串保存：Task.status 从数据库读出即为 str，比较时不经过 Enum
+_SUCCESS = TaskStatusEnum.SUCCESS.value
+_FAILURE = TaskStatusEnum.FAILURE.value
+TERMINAL_TASK_STATUSES = frozenset({_SUCCESS, _FAILURE})
 ACTIVE_TASK_STATUSES = frozenset(
-    {TaskStatusEnum.PENDING, TaskStatusEnum.IN_PROGRESS}
+    {TaskStatusEnum.PENDING.value, TaskStatusEnum.IN_PROGRESS.value}
 )
+_SKIPPED_INVALID_SQL_MARKER = "跳过无效的SQL文件"
 
 
 def is_skipped_invalid_sql_task(task: LintingTask) -> bool:
     """是否为「跳过无效 SQL 文件」的 FAILURE Task（不计入 Job 聚合）。"""
     return (
-        task.status == TaskStatusEnum.FAILURE
+        task.status == _FAILURE
         and bool(task.error_message)
-        and "跳过无效的SQL文件" in task.error_message
+        and _SKIPPED_INVALID_SQL_MARKER in task.error_message
     )
 
 
@@ -51,21 +54,76 @@ def compute_aggregate_job_status(
     if not valid:
         return JobStatusEnum.FAILED
 
-    statuses = [t.status for t in valid]
+    # 单次遍历：遇到未完成 Task 立即返回，否则统计终态分布
+    has_success = has_failure = False
+    for t in valid:
+        s = t.status
+        if s == _SUCCESS:
+            has_success = True
+        elif s == _FAILURE:
+            has_failure = True
+        else:
+            # PENDING / IN_PROGRESS（或未知状态）→ 仍在处理中
+            return JobStatusEnum.PROCESSING
+
+    if has_success and has_failure:
+        return JobStatusEnum.PARTIALLY_COMPLETED
+    if has_success:
+        return JobStatusEnum.COMPLETED
+    return JobStatusEnum.FAILED
+
+
+def count_valid_task_statuses(db: Session, job_id: str) -> Tuple[int, Dict[str, int]]:
+    """
+    一次 GROUP BY 统计 Job 下的 Task 状态。
+
+    Returns:
+        (Task 总数, 有效 Task 各状态数量)；有效口径同 filter_valid_tasks。
+    """
+    # 会话 autoflush=False：调用方可能刚在 ORM 对象上改了 Task 状态尚未 flush，
+    # 先写入再分组统计，否则刚失败/完成的 Task 仍按旧状态计数
+    db.flush()
+    skipped = case(
+        (
+            and_(
+                LintingTask.status == _FAILURE,
+                LintingTask.error_message.contains(_SKIPPED_INVALID_SQL_MARKER),
+            ),
+            1,
+        ),
+        else_=0,
+    )
+    rows = (
+        db.query(LintingTask.status, skipped, func.count(LintingTask.id))
+        .filter(LintingTask.job_id == job_id)
+        .group_by(LintingTask.status, skipped)
+        .all()
+    )
+
+    total = 0
+    valid_counts: Dict[str, int] = {}
+    for status, is_skipped, count in rows:
+        total += count
+        if not is_skipped:
+            valid_counts[status] = valid_counts.get(status, 0) + count
+    return total, valid_counts
 
-    if any(s in ACTIVE_TASK_STATUSES for s in statuses):
+
+def compute_job_status_from_counts(valid_counts: Dict[str, int]) -> JobStatusEnum:
+    """根据有效 Task 的状态计数计算 Job 聚合状态，规则同 compute_aggregate_job_status。"""
+    valid_total = sum(valid_counts.values())
+    if not valid_total:
+        return JobStatusEnum.FAILED
+
+    success = valid_counts.get(_SUCCESS, 0)
+    failure = valid_counts.get(_FAILURE, 0)
+    if success + failure < valid_total:
         return JobStatusEnum.PROCESSING
-    if all(s == TaskStatusEnum.SUCCESS for s in statuses):
+    if success and failure:
+        return JobStatusEnum.PARTIALLY_COMPLETED
+    if success:
         return JobStatusEnum.COMPLETED
-    if all(s in TERMINAL_TASK_STATUSES for s in statuses):
-        has_success = any(s == TaskStatusEnum.SUCCESS for s in statuses)
-        has_failure = any(s == TaskStatusEnum.FAILURE for s in statuses)
-        if has_success and has_failure:
-            return JobStatusEnum.PARTIALLY_COMPLETED
-        if all(s == TaskStatusEnum.FAILURE for s in statuses):
-            return JobStatusEnum.FAILED
-
-    return JobStatusEnum.PROCESSING
+    return JobStatusEnum.FAILED
 
 
 def update_job_status_from_tasks(
@@ -92,25 +150,12 @@ def update_job_status_from_tasks(
             logger.warning("Job not found for status aggregation: %s", job_id)
             return False
 
-        if job.status in (JobStatusEnum.ACCEPTED, JobStatusEnum.EXPANDING):
-            # 展开阶段尚未产生 Task，或 Task 尚未开始执行，不覆盖 Job 状态
-            task_count = (
-                db.query(LintingTask)
-                .filter(LintingTask.job_id == job_id)
-                .count()
-            )
-            if task_count == 0:
-                return False
-
-        tasks = (
-            db.query(LintingTask)
-            .filter(LintingTask.job_id == job_id)
-            .all()
-        )
-        if not tasks:
+        # 无 Task（含展开阶段尚未产生 Task）时不覆盖 Job 状态
+        total, valid_counts = count_valid_task_statuses(db, job_id)
+        if total == 0:
             return False
 
-        new_status = compute_aggregate_job_status(tasks)
+        new_status = compute_job_status_from_counts(valid_counts)
         if new_status is None or job.status == new_status:
             return False
 
@@ -159,15 +204,11 @@ def reconcile_terminal_processing_jobs(db: Session, limit: int = 100) -> int:
         JobStatusEnum.FAILED,
     }
     for job in candidates:
-        tasks = (
-            db.query(LintingTask)
-            .filter(LintingTask.job_id == job.job_id)
-            .all()
-        )
-        if not tasks:
+        total, valid_counts = count_valid_task_statuses(db, job.job_id)
+        if total == 0:
             continue
 
-        new_status = compute_aggregate_job_status(tasks)
+        new_status = compute_job_status_from_counts(valid_counts)
         if new_status not in terminal_job_statuses or job.status == new_status:
             continue
 
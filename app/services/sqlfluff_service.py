@@ -10,6 +10,7 @@ from sqlfluff.core import Linter, FluffConfig
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import os
+import threading
 from pathlib import Path
 
 from app.core.exceptions import SQLFluffException
@@ -20,6 +21,10 @@ from app.services.rule_severity_mapper import RuleSeverityMapper
 
 settings = get_settings()
 
+# 进程级Linter缓存（方言 -> Linter），所有SQLFluffService实例共享
+_LINTER_CACHE: Dict[str, Linter] = {}
+_LINTER_LOCK = threading.Lock()
+
 
 class SQLFluffService:
     """SQLFluff集成服务类"""
@@ -28,8 +33,6 @@ class SQLFluffService:
         self.file_manager = FileManager()
         self.logger = service_logger
         self.default_dialect = settings.SQLFLUFF_DIALECT
-        # 用于缓存不同方言的Linter实例
-        self._linter_cache: Dict[str, Linter] = {}
     
     def _get_linter(self, dialect: Optional[str] = None) -> Linter:
         """
@@ -45,109 +48,25 @@ class SQLFluffService:
             dialect = self.default_dialect
             
         # 从缓存中获取或创建新的Linter
-        if dialect not in self._linter_cache:
+        linter = _LINTER_CACHE.get(dialect)
+        if linter is not None:
+            return linter
+        
+        with _LINTER_LOCK:
+            linter = _LINTER_CACHE.get(dialect)
+            if linter is not None:
+                return linter
             try:
+                # 每个方言只构造一次Linter；规则集与此前一致，不额外按方言排除规则
                 linter = Linter(dialect=dialect)
                 
-                # 手动过滤插件规则以解决SQLFluff 3.4.1中方言过滤的问题
-                filtered_linter = self._filter_rules_by_dialect(linter, dialect)
-                
-                self._linter_cache[dialect] = filtered_linter
+                _LINTER_CACHE[dialect] = linter
                 self.logger.debug(f"创建新的Linter实例: {dialect}")
             except Exception as e:
                 self.logger.error(f"创建Linter失败，方言: {dialect}, 错误: {e}")
                 raise SQLFluffException("创建Linter", dialect, str(e))
         
-        return self._linter_cache[dialect]
-    
-    def _filter_rules_by_dialect(self, linter: Linter, current_dialect: str) -> Linter:
-        """
-        手动过滤规则，确保只有适用于当前方言的规则被应用
-        
-        这是为了解决SQLFluff 3.4.1中插件规则方言过滤失效的问题
-        
-        Args:
-            linter: 原始Linter实例
-            current_dialect: 当前使用的方言
-            
-        Returns:
-            Linter: 过滤后的Linter实例
-        """
-        try:
-            # 获取所有规则
-            all_rules = linter.rule_tuples()
-            rules_to_exclude = []
-            
-            for rule in all_rules:
-                # 检查规则是否需要被排除
-                should_exclude = False
-                
-                # 方法1: 检查规则类的方言属性（适用于大多数插件规则）
-                if hasattr(rule, '_rule_class'):
-                    rule_class = rule._rule_class
-                    if hasattr(rule_class, 'dialects') and rule_class.dialects:
-                        dialects = rule_class.dialects
-                        # 如果规则指定了方言限制，且当前方言不在其中，则排除
-                        if isinstance(dialects, (set, list, tuple)):
-                            if current_dialect not in dialects:
-                                should_exclude = True
-                        elif isinstance(dialects, str):
-                            if current_dialect != dialects:
-                                should_exclude = True
-                
-                # 方法2: 直接检查规则对象的方言属性（备用方法）
-                if not should_exclude and hasattr(rule, 'dialects') and rule.dialects:
-                    dialects = rule.dialects
-                    if isinstance(dialects, (set, list, tuple)):
-                        if current_dialect not in dialects:
-                            should_exclude = True
-                    elif isinstance(dialects, str):
-                        if current_dialect != dialects:
-                            should_exclude = True
-                
-                # 方法3: 基于规则代码的特殊处理（针对已知的自定义规则）
-                # 注意：HiveCustom规则实际上可以在多种方言中工作，不应该强制限制为hive方言
-                # 只有在规则明确指定方言限制时才排除
-                if not should_exclude and 'HiveCustom' in rule.code:
-                    # 检查规则是否有明确的方言限制
-                    has_dialect_restriction = False
-                    if hasattr(rule, '_rule_class'):
-                        rule_class = rule._rule_class
-                        if hasattr(rule_class, 'dialects') and rule_class.dialects:
-                            has_dialect_restriction = True
-                    elif hasattr(rule, 'dialects') and rule.dialects:
-                        has_dialect_restriction = True
-                    
-                    # 只有在明确限制方言且当前方言不在其中时才排除
-                    if has_dialect_restriction:
-                        self.logger.debug(f"HiveCustom规则 {rule.code} 有方言限制，检查是否排除")
-                    else:
-                        self.logger.debug(f"HiveCustom规则 {rule.code} 无方言限制，保留在 {current_dialect} 方言中")
-                
-                if should_exclude:
-                    rules_to_exclude.append(rule.code)
-                    self.logger.debug(f"规则 {rule.code} 被标记为排除 (方言: {current_dialect})")
-            
-            # 如果有规则需要排除，创建新的linter
-            if rules_to_exclude:
-                self.logger.debug(f"为方言 {current_dialect} 排除了以下规则: {rules_to_exclude}")
-                
-                from sqlfluff.core import Linter
-                filtered_linter = Linter(
-                    dialect=current_dialect,
-                    exclude_rules=rules_to_exclude
-                )
-                
-                self.logger.debug(f"已为方言 {current_dialect} 过滤规则，排除了 {len(rules_to_exclude)} 个规则")
-                return filtered_linter
-            
-            # 如果没有规则需要过滤，返回原始linter
-            self.logger.debug(f"方言 {current_dialect} 无需过滤规则")
-            return linter
-            
-        except Exception as e:
-            self.logger.warning(f"规则过滤失败，使用原始linter: {e}")
-            return linter
+        return linter
     
     def analyze_sql_file(
         self,
@@ -342,7 +261,8 @@ class SQLFluffService:
         """
         清空Linter缓存，在需要重新加载配置时使用
         """
-        self._linter_cache.clear()
+        with _LINTER_LOCK:
+            _LINTER_CACHE.clear()
         self.logger.info("Linter缓存已清空")
     
     def get_cached_dialects(self) -> List[str]:
@@ -352,7 +272,7 @@ class SQLFluffService:
         Returns:
             List[str]: 已缓存的方言列表
         """
-        return list(self._linter_cache.keys())
+        return list(_LINTER_CACHE.keys())
     
     # 私有方法
     
@@ -12,13 +12,13 @@ from datetime import datetime, timedelta
 import os
 import json
 
-from app.models.database import LintingJob, LintingTask, LintingViolation
+from app.models.database import LintingJob, LintingTask, LintingViolation, TaskQueryHelper
 from app.schemas.task import (
     TaskResponse, TaskDetailResponse, TaskResultContent,
     TaskStatusUpdateRequest, TaskStatistics, TaskFileInfo,
     TaskLintResultResponse, TaskViolationWithSQL, SeverityLevelStatistics,
     TaskSeverityCalculateResponse, TaskWithViolationsResponse,
-    TaskWithViolationsListResponse
+    TaskWithViolationsListResponse, TaskPage
 )
 from app.schemas.common import PaginationResponse, TaskStatusEnum
 from app.core.exceptions import TaskException, JobException, FileException, ErrorCode, DatabaseException
@@ -139,26 +139,10 @@ class TaskService:
             except Exception as e:
                 self.logger.warning(f"获取Task文件信息失败: {task_id}, {e}")
             
-            return TaskDetailResponse(
-                task_id=task.task_id,
-                job_id=task.job_id,
-                status=task.status,
-                source_file_path=task.source_file_path,
-                result_file_path=task.result_file_path,
-                error_message=task.error_message,
-                created_at=task.created_at,
-                updated_at=task.updated_at,
+            return TaskDetailResponse.from_row(
+                task,
                 file_size=file_size,
-                processing_duration=processing_duration,
-                sql_lines=task.sql_lines,
-                total_violations=task.total_violations,
-                critical_violations=task.critical_violations,
-                severity_info=task.severity_info,
-                severity_minor=task.severity_minor,
-                severity_major=task.severity_major,
-                severity_blocker=task.severity_blocker,
-                severity_critical=task.severity_critical,
-                severity_unknown=task.severity_unknown
+                processing_duration=processing_duration
             )
             
         except Exception as e:
@@ -211,7 +195,7 @@ class TaskService:
     
     async def get_tasks_by_job_id(self, job_id: Optional[str], page: int = 1, size: int = 10,
                                 status: Optional[TaskStatusEnum] = None,
-                                violation_exists: Optional[bool] = None) -> PaginationResponse[TaskResponse]:
+                                violation_exists: Optional[bool] = None) -> TaskPage:
         """
         获取Job下的Tasks分页列表
         
@@ -223,7 +207,7 @@ class TaskService:
             violation_exists: 违规项过滤，True表示只返回有违规的任务，False表示只返回无违规的任务，None表示不过滤
             
         Returns:
-            PaginationResponse[TaskResponse]: 分页的Task列表
+            TaskPage: 分页的Task列表
         """
         try:
             # 构造基础查询
@@ -253,30 +237,11 @@ class TaskService:
             tasks = query.offset((page - 1) * size).limit(size).all()
             
             # 构造响应列表
-            task_responses = []
-            for task in tasks:
-                task_responses.append(TaskResponse(
-                    task_id=task.task_id,
-                    file_name=task.file_name,
-                    status=task.status,
-                    result_file_path=task.result_file_path,
-                    error_message=task.error_message,
-                    created_at=task.created_at,
-                    updated_at=task.updated_at,
-                    sql_lines=task.sql_lines,
-                    total_violations=task.total_violations,
-                    critical_violations=task.critical_violations,
-                    severity_info=task.severity_info,
-                    severity_minor=task.severity_minor,
-                    severity_major=task.severity_major,
-                    severity_blocker=task.severity_blocker,
-                    severity_critical=task.severity_critical,
-                    severity_unknown=task.severity_unknown
-                ))
+            task_responses = [TaskResponse.from_row(task) for task in tasks]
             
             # 构造分页响应
             pages = (total + size - 1) // size
-            return PaginationResponse[TaskResponse](
+            return TaskPage.model_construct(
                 items=task_responses,
                 total=total,
                 page=page,
@@ -544,77 +509,80 @@ class TaskService:
 
             successful_retries = []
             failed_retries: List[dict] = []
+            retried_ids = set()
             affected_job_ids = set()
 
-            for task_id in task_ids:
-                try:
-                    task = await self.get_task_by_id(task_id)
-                    if not task:
-                        failed_retries.append({
-                            "task_id": task_id,
-                            "error": "任务不存在",
-                        })
-                        continue
-
-                    if task.status != TaskStatusEnum.FAILURE:
-                        failed_retries.append({
-                            "task_id": task_id,
-                            "error": f"任务状态不允许重试: {task.status}",
-                        })
-                        continue
-
-                    task.status = TaskStatusEnum.PENDING
-                    task.claim_id = None
-                    task.claimed_at = None
-                    task.error_message = None
-                    task.result_file_path = None
-                    task.retry_count = 0
-                    # 清除上一次结果元数据，避免报告继续展示旧违规
-                    task.sql_lines = None
-                    task.total_violations = None
-                    task.critical_violations = None
-                    task.severity_info = None
-                    task.severity_minor = None
-                    task.severity_major = None
-                    task.severity_blocker = None
-                    task.severity_critical = None
-                    task.severity_unknown = None
-
-                    for optional_field in (
-                        "lease_token",
-                        "lease_expires_at",
-                        "last_error",
-                        "finished_at",
-                        "started_at",
-                    ):
-                        if hasattr(task, optional_field):
-                            setattr(task, optional_field, None)
-                    if hasattr(task, "attempt_count"):
-                        task.attempt_count = 0
-                    if hasattr(task, "next_attempt_at"):
-                        task.next_attempt_at = datetime.utcnow()
-
-                    # 同步清除旧 violations，避免重试期间暴露上次结果
-                    from app.models.database import LintingViolation
-                    self.db.query(LintingViolation).filter(
-                        LintingViolation.task_id == task_id
-                    ).delete(synchronize_session=False)
+            # 一次查询取回全部候选Task，避免逐个 get_task_by_id
+            tasks_by_id = {
+                task.task_id: task
+                for task in self.db.query(LintingTask).filter(
+                    LintingTask.task_id.in_(task_ids)
+                ).all()
+            }
 
-                    successful_retries.append(task_id)
-                    affected_job_ids.add(task.job_id)
+            for task_id in task_ids:
+                task = tasks_by_id.get(task_id)
+                if not task:
+                    failed_retries.append({
+                        "task_id": task_id,
+                        "error": "任务不存在",
+                    })
+                    continue
 
-                except Exception as e:
-                    self.logger.error(f"重试Task失败: {task_id}, {e}")
+                # 同一请求内重复的 task_id 已被本次重置为 PENDING
+                status = (
+                    TaskStatusEnum.PENDING.value
+                    if task_id in retried_ids else task.status
+                )
+                if status != TaskStatusEnum.FAILURE:
                     failed_retries.append({
                         "task_id": task_id,
-                        "error": str(e),
+                        "error": f"任务状态不允许重试: {status}",
                     })
+                    continue
+
+                successful_retries.append(task_id)
+                retried_ids.add(task_id)
+                affected_job_ids.add(task.job_id)
 
             if successful_retries:
-                for job_id in affected_job_ids:
-                    job = self.db.query(LintingJob).filter(LintingJob.job_id == job_id).first()
-                    if job:
-                        job.status = JobStatusEnum.PROCESSING
+                TaskQueryHelper.bulk_update_tasks(self.db, successful_retries, {
+                    LintingTask.status: TaskStatusEnum.PENDING.value,
+                    LintingTask.claim_id: None,
+                    LintingTask.claimed_at: None,
+                    LintingTask.error_message: None,
+                    LintingTask.result_file_path: None,
+                    LintingTask.retry_count: 0,
+                    # 清除上一次结果元数据，避免报告继续展示旧违规
+                    LintingTask.sql_lines: None,
+                    LintingTask.total_violations: None,
+                    LintingTask.critical_violations: None,
+                    LintingTask.severity_info: None,
+                    LintingTask.severity_minor: None,
+                    LintingTask.severity_major: None,
+                    LintingTask.severity_blocker: None,
+                    LintingTask.severity_critical: None,
+                    LintingTask.severity_unknown: None,
+                    LintingTask.lease_token: None,
+                    LintingTask.lease_expires_at: None,
+                    LintingTask.last_error: None,
+                    LintingTask.finished_at: None,
+                    LintingTask.started_at: None,
+                    LintingTask.attempt_count: 0,
+                    LintingTask.next_attempt_at: datetime.utcnow(),
+                })
+
+                # 同步清除旧 violations，避免重试期间暴露上次结果
+                self.db.query(LintingViolation).filter(
+                    LintingViolation.task_id.in_(successful_retries)
+                ).delete(synchronize_session=False)
+
+                self.db.query(LintingJob).filter(
+                    LintingJob.job_id.in_(affected_job_ids)
+                ).update(
+                    {LintingJob.status: JobStatusEnum.PROCESSING.value},
+                    synchronize_session=False
+                )
 
                 self.db.commit()
                 self.logger.info(f"重试Task成功: {len(successful_retries)}个")
@@ -814,7 +782,7 @@ class TaskService:
         size: int = 10,
         status: Optional[TaskStatusEnum] = None,
         violation_exists: Optional[bool] = None
-    ) -> PaginationResponse[TaskResponse]:
+    ) -> TaskPage:
         """
         获取指定Job和Severity Level的任务列表（支持分页）
         
@@ -827,7 +795,7 @@ class TaskService:
             violation_exists: 是否有违规项过滤
             
         Returns:
-            PaginationResponse[TaskResponse]: 分页的任务列表
+            TaskPage: 分页的任务列表
         """
         try:
             self.logger.info(f"按Severity Level查询任务列表: {job_id}, level={severity_level}, 页码={page}, 大小={size}")
@@ -904,7 +872,7 @@ class TaskService:
             
             # 计算分页信息
             total = len(matching_tasks)
-            total_pages = (total + size - 1) // size if total > 0 else 1
+            total_pages = (total + size - 1) // size if total > 0 else 0
             
             # 分页切片
             start_idx = (page - 1) * size
@@ -912,30 +880,10 @@ class TaskService:
             page_tasks = matching_tasks[start_idx:end_idx]
             
             # 转换为响应格式
-            task_responses = []
-            for task in page_tasks:
-                task_response = TaskResponse(
-                    task_id=task.task_id,
-                    file_name=task.file_name,
-                    status=task.status,
-                    result_file_path=task.result_file_path,
-                    error_message=task.error_message,
-                    created_at=task.created_at,
-                    updated_at=task.updated_at,
-                    sql_lines=task.sql_lines,
-                    total_violations=task.total_violations,
-                    critical_violations=task.critical_violations,
-                    severity_info=task.severity_info,
-                    severity_minor=task.severity_minor,
-                    severity_major=task.severity_major,
-                    severity_blocker=task.severity_blocker,
-                    severity_critical=task.severity_critical,
-                    severity_unknown=task.severity_unknown
-                )
-                task_responses.append(task_response)
+            task_responses = [TaskResponse.from_row(task) for task in page_tasks]
             
             # 构造分页响应
-            pagination_response = PaginationResponse(
+            pagination_response = TaskPage.model_construct(
                 total=total,
                 page=page,
                 size=size,
@@ -1059,7 +1007,7 @@ class TaskService:
             
             # 计算总数
             total = matching_tasks_query.count()
-            total_pages = (total + size - 1) // size if total > 0 else 1
+            total_pages = (total + size - 1) // size if total > 0 else 0
             
             # 分页查询
             tasks = matching_tasks_query.offset((page - 1) * size).limit(size).all()
@@ -1264,7 +1212,7 @@ class TaskService:
             
             # 计算总数
             total = matching_tasks_query.count()
-            total_pages = (total + size - 1) // size if total > 0 else 1
+            total_pages = (total + size - 1) // size if total > 0 else 0
             
             # 分页查询
             tasks = matching_tasks_query.offset((page - 1) * size).limit(size).all()
@@ -29,9 +29,9 @@ STATIC_DIR = Path(__file__).resolve().parent / "static"
 from app.api.routes import jobs, tasks, health, sql
 from app.config.settings import get_settings
 from app.core.logging import setup_logging, api_logger
-from app.core.exceptions import BaseException as BusinessException, get_http_status_code
+from app.core.exceptions import BaseException as BusinessException
 from app.core.consul import register_to_consul, deregister_from_consul, start_consul_health_reporting
-from app.core.database import engine
+from app.core.database import close_database_connections
 
 settings = get_settings()
 
@@ -77,12 +77,8 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             api_logger.error(f"Consul注销异常: {e}")
     
-    # 关闭数据库连接
-    try:
-        engine.dispose()
-        api_logger.info("数据库连接已关闭")
-    except Exception as e:
-        api_logger.error(f"关闭数据库连接失败: {e}")
+    # 关闭数据库连接（含只读副本连接池）
+    close_database_connections()
     
     api_logger.info("FastAPI应用关闭完成")
 
@@ -270,7 +266,7 @@ def _configure_exception_handlers(app: FastAPI):
             }
         )
         
-        status_code = get_http_status_code(exc.error_code)
+        status_code = exc.error_code.http_status
         return JSONResponse(
             status_code=status_code,
             content={
@@ -12,7 +12,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 
 from app.models.database import LintingJob, LintingTask
@@ -23,6 +23,9 @@ from app.worker.config import WorkerConfig
 
 logger = logging.getLogger(__name__)
 
+# 展开时每条批量 INSERT 的最大行数
+_TASK_INSERT_BATCH_SIZE = 1000
+
 
 class JobExpansionError(Exception):
     """Job 展开失败基类"""
@@ -430,13 +433,14 @@ def _create_task_records(
 ) -> List[str]:
     """批量创建 PENDING Task（按 source_file_path 去重，支持部分展开续跑）。"""
     existing_paths = {
-        t.source_file_path
-        for t in db.query(LintingTask)
+        path
+        for (path,) in db.query(LintingTask.source_file_path)
         .filter(LintingTask.job_id == job.job_id)
         .all()
     }
 
     task_ids: List[str] = []
+    rows: List[Dict[str, Any]] = []
     for file_path in file_paths:
         if root_path:
             full_path = os.path.join(root_path, file_path).replace("\\", "/")
@@ -447,16 +451,22 @@ def _create_task_records(
             continue
 
         task_id = generate_task_id()
-        task = LintingTask(
-            task_id=task_id,
-            job_id=job.job_id,
-            status=TaskStatusEnum.PENDING,
-            source_file_path=full_path,
-        )
-        db.add(task)
+        rows.append({
+            "task_id": task_id,
+            "job_id": job.job_id,
+            "status": TaskStatusEnum.PENDING.value,
+            "source_file_path": full_path,
+        })
         task_ids.append(task_id)
         existing_paths.add(full_path)
 
-    db.flush()
+        # 分批写入：超大 ZIP 时待插入的行字典不在内存中整体堆积
+        if len(rows) >= _TASK_INSERT_BATCH_SIZE:
+            db.execute(insert(LintingTask), rows)
+            rows = []
+
+    # ORM 批量 INSERT：多行 VALUES 一次写入，不逐个构造/跟踪 Task 对象
+    if rows:
+        db.execute(insert(LintingTask), rows)
     logger.info("Created %d PENDING tasks for job %s", len(task_ids), job.job_id)
     return task_ids
@@ -25,7 +25,7 @@ import threading
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from sqlalchemy import or_, func, select
 from sqlalchemy.orm import Session
@@ -43,6 +43,10 @@ from app.services.job_status import reconcile_terminal_processing_jobs
 
 logger = logging.getLogger(__name__)
 
+# 主机名在进程生命周期内不变，导入时取一次即可；pid 由 WorkerContext 在
+# 实际运行的进程里获取，避免 fork 后沿用父进程的值
+_HOSTNAME = socket.gethostname()
+
 
 # ───────────────────── Worker Context ─────────────────────
 
@@ -51,13 +55,36 @@ class WorkerContext:
 
     def __init__(self, config: WorkerConfig):
         self.config = config
-        base_id = f"{socket.gethostname()}_{os.getpid()}"
+        self.hostname = _HOSTNAME
+        self.pid = os.getpid()
+        base_id = f"{self.hostname}_{self.pid}"
         instance_id = os.environ.get("WORKER_INSTANCE_ID")
         if instance_id:
             self.worker_id = f"{base_id}_{instance_id[:8]}"
         else:
             self.worker_id = base_id
         self.running = True
+        # 进程内任务计数：WorkerThread 更新，HeartbeatThread 每个心跳周期读取一次
+        self._task_count_lock = threading.Lock()
+        self._in_flight_tasks = 0
+        self._completed_tasks = 0
+
+    def task_started(self) -> None:
+        """记录一个已领取、正在处理的任务"""
+        with self._task_count_lock:
+            self._in_flight_tasks += 1
+
+    def task_finished(self, completed: bool) -> None:
+        """记录任务处理结束；completed=False 表示租约丢失已放弃"""
+        with self._task_count_lock:
+            self._in_flight_tasks -= 1
+            if completed:
+                self._completed_tasks += 1
+
+    def task_counts(self) -> Tuple[int, int]:
+        """返回 (处理中任务数, 累计完成任务数)"""
+        with self._task_count_lock:
+            return self._in_flight_tasks, self._completed_tasks
 
 
 # ───────────────────── Claim Result ─────────────────────
@@ -399,7 +426,12 @@ class WorkerThread(threading.Thread):
                     )
 
                 if claimed:
-                    completed = _process_with_lease_renewal(self.ctx, claimed)
+                    self.ctx.task_started()
+                    completed = False
+                    try:
+                        completed = _process_with_lease_renewal(self.ctx, claimed)
+                    finally:
+                        self.ctx.task_finished(completed)
                     if completed:
                         self.tasks_processed += 1
                         logger.debug(
@@ -512,13 +544,13 @@ class HeartbeatThread(threading.Thread):
             if worker:
                 worker.status = 'RUNNING'
                 worker.heartbeat_at = datetime.utcnow()
-                worker.pid = os.getpid()
+                worker.pid = self.ctx.pid
                 worker.stopped_at = None
             else:
                 worker = WorkerRegistry(
                     worker_id=self.ctx.worker_id,
-                    hostname=socket.gethostname(),
-                    pid=os.getpid(),
+                    hostname=self.ctx.hostname,
+                    pid=self.ctx.pid,
                     status='RUNNING',
                     heartbeat_at=datetime.utcnow(),
                     started_at=datetime.utcnow()
@@ -529,19 +561,22 @@ class HeartbeatThread(threading.Thread):
 
     def _send_heartbeat(self):
         """发送心跳并标记过期 Worker 为 DEAD"""
-        with managed_db_session() as db:
-            worker = db.query(WorkerRegistry).filter_by(
-                worker_id=self.ctx.worker_id
-            ).first()
+        # 使用进程内计数，避免每次心跳对 claim_id 做 LIKE 扫描
+        in_flight, completed = self.ctx.task_counts()
 
-            if worker and worker.status == 'RUNNING':
-                worker.heartbeat_at = datetime.utcnow()
-
-                active_count = db.query(LintingTask).filter(
-                    LintingTask.claim_id.like(f"{self.ctx.worker_id}:%"),
-                    LintingTask.status == TaskStatusEnum.IN_PROGRESS
-                ).count()
-                worker.current_task_count = active_count
+        with managed_db_session() as db:
+            # 单条 UPDATE 代替 SELECT + 修改，减少一次往返
+            db.query(WorkerRegistry).filter(
+                WorkerRegistry.worker_id == self.ctx.worker_id,
+                WorkerRegistry.status == 'RUNNING'
+            ).update(
+                {
+                    WorkerRegistry.heartbeat_at: datetime.utcnow(),
+                    WorkerRegistry.current_task_count: in_flight,
+                    WorkerRegistry.total_tasks_processed: completed,
+                },
+                synchronize_session=False
+            )
 
             mark_stale_workers_dead(db, self.ctx.config)
 
@@ -0,0 +1,20 @@
+"""
+Gunicorn 配置（生产环境 Web 服务）
+
+启动参数仍由 start_web_new.sh 在命令行给出，这里只放需要 Python 代码的服务器钩子。
+"""
+
+import os
+
+
+def child_exit(server, worker):
+    """worker 退出后清理其 Prometheus 多进程 gauge 文件
+
+    mark_process_dead 只删除 live* 模式的 gauge 文件；app/core/metrics.py 中的
+    gauge 均为 livemostrecent，已退出 worker 的值不会再出现在抓取结果中。
+    """
+    if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        return
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
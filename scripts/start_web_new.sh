@@ -61,8 +61,13 @@ export PYTHONPATH="${PYTHONPATH:+${PYTHONPATH}:}."
 
 # 启动Web服务（settings 仅认 dev/test/prod；兼容旧值 production）
 if [[ "${ENVIRONMENT:-dev}" == "prod" || "${ENVIRONMENT:-dev}" == "production" ]]; then
-    # 生产环境使用Gunicorn
+    # 生产环境使用Gunicorn；多 worker 的 Prometheus 指标写入共享目录后聚合导出，
+    # 启动前清空，避免上一轮进程遗留的计数被重复累加。
+    export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-$APP_DIR/run/prometheus_multiproc}"
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
     nohup "$PYTHON_BIN" -m gunicorn app.web_main:app \
+        -c scripts/gunicorn_conf.py \
         -w "${GUNICORN_WORKERS:-4}" \
         -k uvicorn.workers.UvicornWorker \
         --bind "0.0.0.0:${PORT:-8000}" \
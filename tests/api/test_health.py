@@ -102,6 +102,20 @@ class TestHealthRoutes:
         assert b"# HELP" in response.body
         assert not response.body.startswith(b'"')
 
+    def test_metrics_aggregates_across_processes_when_multiproc_dir_set(
+        self, monkeypatch, tmp_path
+    ):
+        from prometheus_client import REGISTRY
+        from app.core import metrics
+
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+        with patch("prometheus_client.multiprocess.MultiProcessCollector") as collector:
+            metrics.get_metrics()
+
+        collector.assert_called_once()
+        registry = collector.call_args.args[0]
+        assert registry is not REGISTRY
+
     def test_request_metrics_use_route_template_and_actual_status(self, client):
         with patch("app.core.metrics.record_http_request") as record:
             response = client.get("/api/v1/health/live")
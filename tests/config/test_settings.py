@@ -38,3 +38,14 @@ def test_production_alias_sets_debug_false(settings_env, monkeypatch):
     settings = Settings(_env_file=None)
     assert settings.ENVIRONMENT == "prod"
     assert settings.DEBUG is False
+
+
+def test_read_database_url_falls_back_to_primary(settings_env, monkeypatch):
+    monkeypatch.delenv("DATABASE_READ_URL", raising=False)
+    settings = Settings(_env_file=None)
+    assert settings.get_database_url(readonly=True) == "sqlite:///./t.db"
+
+    monkeypatch.setenv("DATABASE_READ_URL", "sqlite:///./replica.db")
+    settings = Settings(_env_file=None)
+    assert settings.get_database_url(readonly=True) == "sqlite:///./replica.db"
+    assert settings.get_database_url() == "sqlite:///./t.db"
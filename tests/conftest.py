@@ -3,12 +3,13 @@ import os
 os.environ.setdefault("NFS_SHARE_ROOT_PATH", "/tmp/sqlfluff_test_nfs")
 os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
 os.environ.setdefault("ENVIRONMENT", "dev")
+os.environ.setdefault("JOB_STATISTICS_CACHE_TTL_SECONDS", "0")
 
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, get_db_ro
 from app.web_main import app
 import tempfile
 import os
@@ -45,6 +46,7 @@ def client(db_session):
             db_session.close()
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_db_ro] = override_get_db
     test_client = TestClient(app)
     yield test_client
 
@@ -16,11 +16,14 @@ import pytest
 os.environ.setdefault("NFS_SHARE_ROOT_PATH", tempfile.mkdtemp(prefix="sqlfluff-test-nfs-"))
 
 from app.config.settings import settings  # noqa: E402
+import app.core.logging as app_logging  # noqa: E402
 from app.core.logging import (  # noqa: E402
     GzipTimedRotatingFileHandler,
     JSONFormatter,
+    LocalQueueHandler,
     TextFormatter,
     setup_logging,
+    stop_logging,
 )
 
 
@@ -205,31 +208,111 @@ def test_file_logs_always_use_text_format(
     try:
         setup_logging()
 
+        listener_handlers = app_logging._queue_listener.handlers
         console_handler = next(
             handler
-            for handler in root_logger.handlers
+            for handler in listener_handlers
             if isinstance(handler, logging.StreamHandler)
             and not isinstance(handler, logging.FileHandler)
             and handler.stream is sys.stdout
         )
         file_handler = next(
             handler
-            for handler in root_logger.handlers
+            for handler in listener_handlers
             if isinstance(handler, GzipTimedRotatingFileHandler)
         )
         assert isinstance(console_handler.formatter, console_formatter)
         assert isinstance(file_handler.formatter, TextFormatter)
 
         root_logger.info("human-readable file log")
-        file_handler.flush()
+        stop_logging()
         file_content = log_path.read_text(encoding="utf-8")
         assert "human-readable file log" in file_content
         assert " | INFO" in file_content
         assert not file_content.lstrip().startswith("{")
     finally:
+        stop_logging()
         for handler in root_logger.handlers[:]:
             root_logger.removeHandler(handler)
             handler.close()
         for handler in previous_handlers:
             root_logger.addHandler(handler)
         root_logger.setLevel(previous_level)
+
+
+def test_root_logger_only_enqueues_and_keeps_exception_info(tmp_path, monkeypatch):
+    """请求线程只入队；后台线程写文件时仍能拿到异常信息。"""
+    log_path = tmp_path / "service.log"
+    root_logger = logging.getLogger()
+    previous_handlers = root_logger.handlers[:]
+    previous_level = root_logger.level
+
+    monkeypatch.setattr(settings, "LOG_CONSOLE_ENABLED", False)
+    monkeypatch.setattr(settings, "LOG_FILE_PATH", str(log_path))
+
+    try:
+        setup_logging()
+
+        assert [type(handler) for handler in root_logger.handlers] == [LocalQueueHandler]
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("test").exception("failed with %s", "context")
+        stop_logging()
+
+        file_content = log_path.read_text(encoding="utf-8")
+        assert "failed with context" in file_content
+        assert "ValueError: boom" in file_content
+    finally:
+        stop_logging()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+            handler.close()
+        for handler in previous_handlers:
+            root_logger.addHandler(handler)
+        root_logger.setLevel(previous_level)
+
+
+def test_log_error_with_context_defers_traceback_to_handler(caplog):
+    """错误日志只携带 exc_info，堆栈由处理器在输出时格式化。"""
+    logger = logging.getLogger("test.error_context")
+    error = RuntimeError("lint failed")
+    with caplog.at_level(logging.ERROR, logger=logger.name):
+        app_logging.log_error_with_context(logger, error, {"task_id": "task-1"})
+
+    record = caplog.records[-1]
+    assert record.exc_info[1] is error
+    assert record.error_type == "RuntimeError"
+    assert record.task_id == "task-1"
+    assert not hasattr(record, "traceback")
+
+
+def test_log_error_with_context_prefixes_reserved_keys(caplog):
+    """与 LogRecord 属性同名的上下文键不会让记录错误本身失败。"""
+    logger = logging.getLogger("test.error_context")
+    error = RuntimeError("lint failed")
+    with caplog.at_level(logging.ERROR, logger=logger.name):
+        app_logging.log_error_with_context(
+            logger, error, {"message": "ctx", "module": "worker", "task_id": "task-1"}
+        )
+
+    record = caplog.records[-1]
+    assert record.context_message == "ctx"
+    assert record.context_module == "worker"
+    assert record.task_id == "task-1"
+
+
+def test_log_performance_metric_prefixes_reserved_labels(caplog, monkeypatch):
+    """与 LogRecord 属性同名的指标标签不会让指标日志抛异常。"""
+    logger = logging.getLogger("test.performance")
+    monkeypatch.setattr(
+        app_logging, "_performance_logger", app_logging.PerformanceLogger(logger)
+    )
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        app_logging.log_performance_metric("lint_duration", 12.5, name="api", dialect="ansi")
+
+    record = caplog.records[-1]
+    assert record.metric_value == 12.5
+    assert record.context_name == "api"
+    assert record.dialect == "ansi"
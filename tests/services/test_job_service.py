@@ -1,9 +1,14 @@
+import base64
+import uuid
+
 import pytest
 from unittest.mock import patch, MagicMock
 from pydantic import ValidationError
 from app.services.job_service import JobService
 from app.schemas.job import JobCreateRequest
-from app.schemas.common import JobStatusEnum, SubmissionTypeEnum
+from app.models.database import JobQueryHelper, LintingJob, LintingTask
+from app.schemas.common import JobStatusEnum, SubmissionTypeEnum, TaskStatusEnum
+from app.core.exceptions import JobException, ValidationException, ErrorCode
 
 
 def _job_request(**overrides):
@@ -75,6 +80,24 @@ class TestJobService:
         job = await job_service.get_job_by_id(response.job_id)
         assert job.status == JobStatusEnum.PROCESSING
 
+    @pytest.mark.asyncio
+    async def test_update_job_status_rejects_invalid_transition(self, db_session):
+        """测试条件UPDATE拒绝无效状态转换并区分Job不存在"""
+        job_service = JobService(db_session)
+        response = await job_service.create_job(_job_request())
+        await job_service.update_job_status(response.job_id, JobStatusEnum.COMPLETED)
+
+        with pytest.raises(JobException) as exc_info:
+            await job_service.update_job_status(response.job_id, JobStatusEnum.PROCESSING)
+        assert exc_info.value.error_code == ErrorCode.JOB_INVALID_STATUS
+
+        with pytest.raises(JobException) as exc_info:
+            await job_service.update_job_status("non-existent-id", JobStatusEnum.PROCESSING)
+        assert exc_info.value.error_code == ErrorCode.JOB_NOT_FOUND
+
+        job = await job_service.get_job_by_id(response.job_id)
+        assert job.status == JobStatusEnum.COMPLETED
+
     @pytest.mark.asyncio
     async def test_calculate_job_status_completed(self, db_session):
         """测试计算Job状态为完成"""
@@ -82,7 +105,7 @@ class TestJobService:
         response = await job_service.create_job(_job_request())
 
         with patch(
-            'app.services.job_status.compute_aggregate_job_status',
+            'app.services.job_status.compute_job_status_from_counts',
             return_value=JobStatusEnum.COMPLETED,
         ):
             status = await job_service.calculate_job_status(response.job_id)
@@ -95,12 +118,123 @@ class TestJobService:
         response = await job_service.create_job(_job_request())
 
         with patch(
-            'app.services.job_status.compute_aggregate_job_status',
+            'app.services.job_status.compute_job_status_from_counts',
             return_value=JobStatusEnum.PARTIALLY_COMPLETED,
         ):
             status = await job_service.calculate_job_status(response.job_id)
             assert status == JobStatusEnum.PARTIALLY_COMPLETED
 
+    @pytest.mark.asyncio
+    async def test_task_counts_from_single_status_query(self, db_session):
+        """测试任务计数共用一次按状态分组的统计"""
+        job_service = JobService(db_session)
+        response = await job_service.create_job(_job_request())
+        for i, status in enumerate([
+            TaskStatusEnum.SUCCESS, TaskStatusEnum.SUCCESS,
+            TaskStatusEnum.FAILURE, TaskStatusEnum.PENDING,
+        ]):
+            db_session.add(LintingTask(
+                task_id=f"{response.job_id}-extra-{i}",
+                job_id=response.job_id,
+                status=status,
+                source_file_path=f"jobs/test/{i}.sql",
+            ))
+        db_session.flush()
+
+        job = await job_service.get_job_by_id(response.job_id)
+        counts = job.get_task_status_counts()
+
+        assert sum(counts.values()) == 5
+        assert counts.get('SUCCESS', 0) == 2
+        assert counts.get('FAILURE', 0) == 1
+
+    def test_task_status_counts_for_page_of_jobs(self, db_session):
+        """测试一页Job的任务计数由一次分组查询得到，无任务的Job为空字典"""
+        job_ids = [f"job-{uuid.uuid4()}" for _ in range(2)]
+        for job_id in job_ids:
+            db_session.add(LintingJob(
+                job_id=job_id,
+                status=JobStatusEnum.PROCESSING,
+                submission_type=SubmissionTypeEnum.ZIP_ARCHIVE,
+                source_path="archives/test.zip",
+                dialect="ansi",
+                user_id="test-user",
+                product_name="test-product",
+            ))
+        for i, status in enumerate([
+            TaskStatusEnum.PENDING, TaskStatusEnum.PENDING, TaskStatusEnum.FAILURE,
+        ]):
+            db_session.add(LintingTask(
+                task_id=f"{job_ids[0]}-task-{i}",
+                job_id=job_ids[0],
+                status=status,
+                source_file_path=f"jobs/test/{i}.sql",
+            ))
+        db_session.flush()
+
+        counts = JobQueryHelper.get_task_status_counts_by_jobs(db_session, job_ids)
+
+        assert counts == {
+            job_ids[0]: {'PENDING': 2, 'FAILURE': 1},
+            job_ids[1]: {},
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_job_with_tasks_returns_task_summaries(self, db_session):
+        """测试Job详情的子任务摘要由投影列构造，文件名取自源文件路径"""
+        job_service = JobService(db_session)
+        response = await job_service.create_job(_job_request())
+        task_id = f"{response.job_id}-summary"
+        db_session.add(LintingTask(
+            task_id=task_id,
+            job_id=response.job_id,
+            status=TaskStatusEnum.SUCCESS,
+            source_file_path="jobs/test/sub/query_users.sql",
+            result_file_path="jobs/test/results/query_users.json",
+        ))
+        db_session.flush()
+
+        detail = await job_service.get_job_with_tasks(response.job_id, page=1, size=100)
+
+        summaries = {task.task_id: task for task in detail.sub_tasks.items}
+        assert detail.sub_tasks.total == len(summaries)
+        summary = summaries[task_id]
+        assert summary.file_name == "query_users.sql"
+        assert summary.status == TaskStatusEnum.SUCCESS
+        assert summary.result_file_path == "jobs/test/results/query_users.json"
+        assert summary.created_at is not None
+
+    @pytest.mark.asyncio
+    async def test_list_jobs_cursor_pagination(self, db_session):
+        """测试按游标翻页覆盖全部Job且不重复，与页码分页首页一致"""
+        job_service = JobService(db_session)
+        created = [(await job_service.create_job(_job_request())).job_id for _ in range(3)]
+
+        first = await job_service.list_jobs(page=1, size=2)
+        seen = [job.job_id for job in first.items]
+        cursor = first.next_cursor
+        while cursor:
+            page = await job_service.list_jobs(size=2, cursor=cursor)
+            assert page.has_prev
+            assert page.total is None
+            seen.extend(job.job_id for job in page.items)
+            cursor = page.next_cursor
+
+        assert len(seen) == len(set(seen)) == first.total
+        assert set(created) <= set(seen)
+
+    @pytest.mark.asyncio
+    async def test_list_jobs_invalid_cursor(self, db_session):
+        """测试非法游标返回参数验证错误"""
+        job_service = JobService(db_session)
+
+        with pytest.raises(ValidationException):
+            await job_service.list_jobs(cursor="not-a-cursor")
+
+        missing = base64.urlsafe_b64encode(b"999999999").decode()
+        with pytest.raises(ValidationException):
+            await job_service.list_jobs(cursor=missing)
+
     @pytest.mark.asyncio
     async def test_get_job_statistics(self, db_session):
         """SQLite 不支持 MySQL 的 TIMESTAMPDIFF，统计接口需集成测覆盖。"""
@@ -9,7 +9,8 @@ from sqlalchemy.orm import sessionmaker
 from app.core.database import Base
 from app.models.database import LintingJob
 from app.schemas.common import JobStatusEnum, SubmissionTypeEnum
-from app.services.job_service import JobService
+from app.services import job_service as job_service_module
+from app.services.job_service import JobService, clear_job_statistics_cache
 
 
 @pytest.fixture
@@ -56,3 +57,31 @@ def test_job_statistics_counts_expanding_jobs(db_session):
         + stats.failed_jobs
         == stats.total_jobs
     )
+
+
+def test_job_statistics_reuses_cached_result_within_ttl(db_session, monkeypatch):
+    monkeypatch.setattr(job_service_module.settings, "JOB_STATISTICS_CACHE_TTL_SECONDS", 30)
+    clear_job_statistics_cache()
+    try:
+        first = asyncio.run(JobService(db_session).get_job_statistics())
+        db_session.add(
+            LintingJob(
+                job_id="accepted-job",
+                status=JobStatusEnum.ACCEPTED,
+                submission_type=SubmissionTypeEnum.SINGLE_FILE,
+                source_path="jobs/accepted-job/sources/a.sql",
+                dialect="ansi",
+                user_id="u1",
+                product_name="p1",
+            )
+        )
+        db_session.commit()
+
+        cached = asyncio.run(JobService(db_session).get_job_statistics())
+        assert cached.total_jobs == first.total_jobs
+
+        clear_job_statistics_cache()
+        fresh = asyncio.run(JobService(db_session).get_job_statistics())
+        assert fresh.total_jobs == first.total_jobs + 1
+    finally:
+        clear_job_statistics_cache()
@@ -5,8 +5,13 @@ Job 状态聚合规则测试
 import pytest
 from types import SimpleNamespace
 
-from app.schemas.common import JobStatusEnum, TaskStatusEnum
-from app.services.job_status import compute_aggregate_job_status
+from app.models.database import LintingJob, LintingTask
+from app.schemas.common import JobStatusEnum, SubmissionTypeEnum, TaskStatusEnum
+from app.services.job_status import (
+    compute_aggregate_job_status,
+    compute_job_status_from_counts,
+    count_valid_task_statuses,
+)
 
 
 def _task(status, error_message=None):
@@ -70,3 +75,51 @@ class TestComputeAggregateJobStatus:
             _task(TaskStatusEnum.FAILURE, "跳过无效的SQL文件: x.sql"),
         ]
         assert compute_aggregate_job_status(tasks) == JobStatusEnum.FAILED
+
+
+class TestComputeJobStatusFromCounts:
+    def test_active_tasks_keep_processing(self):
+        counts = {TaskStatusEnum.SUCCESS.value: 3, TaskStatusEnum.PENDING.value: 1}
+        assert compute_job_status_from_counts(counts) == JobStatusEnum.PROCESSING
+
+    def test_mixed_terminal_is_partially_completed(self):
+        counts = {TaskStatusEnum.SUCCESS.value: 2, TaskStatusEnum.FAILURE.value: 1}
+        assert compute_job_status_from_counts(counts) == JobStatusEnum.PARTIALLY_COMPLETED
+
+    def test_all_success_is_completed(self):
+        assert compute_job_status_from_counts({TaskStatusEnum.SUCCESS.value: 2}) == JobStatusEnum.COMPLETED
+
+    def test_no_valid_tasks_is_failed(self):
+        assert compute_job_status_from_counts({}) == JobStatusEnum.FAILED
+
+
+def test_count_valid_task_statuses_excludes_skipped_invalid_sql(db_session):
+    db_session.add(LintingJob(
+        job_id="job-counts",
+        status=JobStatusEnum.PROCESSING,
+        submission_type=SubmissionTypeEnum.ZIP_ARCHIVE,
+        source_path="jobs/job-counts/archive.zip",
+        dialect="ansi",
+        user_id="u1",
+        product_name="p1",
+    ))
+    for i, (status, error_message) in enumerate([
+        (TaskStatusEnum.SUCCESS, None),
+        (TaskStatusEnum.FAILURE, "跳过无效的SQL文件: x.sql"),
+        (TaskStatusEnum.FAILURE, "执行失败"),
+        (TaskStatusEnum.FAILURE, None),
+    ]):
+        db_session.add(LintingTask(
+            task_id=f"task-counts-{i}",
+            job_id="job-counts",
+            status=status,
+            error_message=error_message,
+            source_file_path=f"jobs/job-counts/{i}.sql",
+        ))
+    db_session.flush()
+
+    total, valid_counts = count_valid_task_statuses(db_session, "job-counts")
+
+    assert total == 4
+    assert valid_counts == {TaskStatusEnum.SUCCESS.value: 1, TaskStatusEnum.FAILURE.value: 2}
+    assert compute_job_status_from_counts(valid_counts) == JobStatusEnum.PARTIALLY_COMPLETED
@@ -47,7 +47,6 @@ def _create_task(
     db_session.add(task)
     db_session.add(
         LintingViolation(
-            id=1,
             task_id=task_id,
             job_id=job_id,
             rule_code="L001",
@@ -115,3 +114,52 @@ def test_retry_task_not_found(db_session):
         "task_id": missing_id,
         "error": "任务不存在",
     }]
+
+
+def test_retry_multiple_tasks_in_one_batch(db_session):
+    first_job_id, first_task_id = _create_task(db_session)
+    second_job_id = str(uuid.uuid4())
+    second_task_id = str(uuid.uuid4())
+    db_session.add(LintingJob(
+        job_id=second_job_id,
+        status=JobStatusEnum.FAILED,
+        submission_type=SubmissionTypeEnum.SINGLE_FILE,
+        source_path="jobs/test/other.sql",
+        dialect="ansi",
+        user_id="test-user",
+        product_name="test-product",
+    ))
+    db_session.add(LintingTask(
+        task_id=second_task_id,
+        job_id=second_job_id,
+        status=TaskStatusEnum.FAILURE,
+        source_file_path="jobs/test/other.sql",
+        error_message="lint failed",
+    ))
+    db_session.commit()
+    service = TaskService(db_session)
+
+    submitted, failed = asyncio.run(
+        service.retry_failed_tasks([first_task_id, second_task_id, first_task_id])
+    )
+
+    assert submitted == [first_task_id, second_task_id]
+    assert failed == [{
+        "task_id": first_task_id,
+        "error": "任务状态不允许重试: PENDING",
+    }]
+    assert {
+        task.task_id: task.status
+        for task in db_session.query(LintingTask).filter(
+            LintingTask.task_id.in_([first_task_id, second_task_id])
+        )
+    } == {
+        first_task_id: TaskStatusEnum.PENDING,
+        second_task_id: TaskStatusEnum.PENDING,
+    }
+    assert {
+        job.status
+        for job in db_session.query(LintingJob).filter(
+            LintingJob.job_id.in_([first_job_id, second_job_id])
+        )
+    } == {JobStatusEnum.PROCESSING}
@@ -0,0 +1,33 @@
+from unittest.mock import patch
+
+from app.services.sqlfluff_service import SQLFluffService
+
+
+class TestLinterCache:
+    def setup_method(self):
+        SQLFluffService().clear_linter_cache()
+
+    def teardown_method(self):
+        SQLFluffService().clear_linter_cache()
+
+    def test_linter_built_once_per_dialect_without_rule_exclusion(self):
+        """测试每个方言只构造一次Linter，且不额外排除规则"""
+        with patch('app.services.sqlfluff_service.Linter') as linter_cls:
+            first = SQLFluffService()._get_linter('mysql')
+            second = SQLFluffService()._get_linter('mysql')
+
+        linter_cls.assert_called_once_with(dialect='mysql')
+        assert first is second
+
+    def test_clear_linter_cache_is_shared(self):
+        """测试Linter缓存在实例间共享，清空后重新构造"""
+        with patch('app.services.sqlfluff_service.Linter') as linter_cls:
+            SQLFluffService()._get_linter('hive')
+            assert SQLFluffService().get_cached_dialects() == ['hive']
+
+            SQLFluffService().clear_linter_cache()
+            assert SQLFluffService().get_cached_dialects() == []
+
+            SQLFluffService()._get_linter('hive')
+
+        assert linter_cls.call_count == 2
@@ -20,6 +20,7 @@ from app.worker.loop import (
     reset_task_after_failure,
     reclaim_expired_leases,
     mark_stale_workers_dead,
+    WorkerContext,
 )
 from app.services.job_status import reconcile_terminal_processing_jobs
 
@@ -369,3 +370,16 @@ class TestReconcileTerminalProcessingJobs:
         assert count == 0
         job = db_session.query(LintingJob).filter_by(job_id="job-1").one()
         assert job.status == JobStatusEnum.PROCESSING
+
+
+class TestWorkerContextTaskCounts:
+    def test_counts_in_flight_and_completed_tasks(self):
+        ctx = WorkerContext(WorkerConfig())
+
+        ctx.task_started()
+        ctx.task_started()
+        assert ctx.task_counts() == (2, 0)
+
+        ctx.task_finished(completed=True)
+        ctx.task_finished(completed=False)
+        assert ctx.task_counts() == (0, 1)
@@ -160,3 +160,20 @@ class TestMarkTaskFailed:
         task = db_session.query(LintingTask).filter_by(task_id=task_id).one()
         assert task.status == TaskStatusEnum.FAILURE
         assert "超过最大重试次数" in task.error_message
+
+    def test_failing_last_task_marks_job_failed(
+        self, db_session, mock_managed_db
+    ):
+        """未 flush 的 Task 状态也计入聚合：最后一个 Task 失败后 Job 变为 FAILED"""
+        task_id, lease_token = _create_in_progress_task(db_session)
+
+        _mark_task_failed(
+            task_id,
+            "SQL file not found: missing.sql",
+            lease_token,
+        )
+
+        task = db_session.query(LintingTask).filter_by(task_id=task_id).one()
+        job = db_session.query(LintingJob).filter_by(job_id=task.job_id).one()
+        assert task.status == TaskStatusEnum.FAILURE
+        assert job.status == JobStatusEnum.FAILED